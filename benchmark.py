@@ -0,0 +1,312 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from scraper import TwitterScraper
+
+WORDS = ("python selenium timeline scraping benchmark tweet sentiment fixture browser scroll "
+         "network latency storage analytics search media export session proxy").split()
+
+# Bytes served for every /media/ request, so image blocking shows up in the transfer size
+MEDIA_BYTES = b'\xff\xd8\xff\xe0' + bytes(40 * 1024)
+
+# Bytes fetched by the page so far, including images; blocked requests count as zero
+TRANSFER_SIZE_JS = '''
+return performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))
+    .reduce(function (total, entry) { return total + (entry.transferSize || 0); }, 0);
+'''
+
+# A stand-in for the profile timeline: same article/time/div[lang] structure, fed by infinite scroll
+TIMELINE_TEMPLATE = '''<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Benchmark timeline</title>
+<style>article { height: 160px; border-bottom: 1px solid #ddd; } #sentinel { height: 10px; }</style>
+</head>
+<body>
+<nav><a data-testid="AppTabBar_Home_Link" href="/home">Home</a></nav>
+<main><div id="timeline"></div><div id="sentinel"></div></main>
+<script>
+performance.setResourceTimingBufferSize(1000000);
+var TWEETS = __TWEETS__;
+var PAGE_SIZE = __PAGE_SIZE__;
+var LATENCY_MS = __LATENCY_MS__;
+var rendered = 0;
+var loading = false;
+function renderPage() {
+    var timeline = document.getElementById('timeline');
+    var end = Math.min(rendered + PAGE_SIZE, TWEETS.length);
+    for (; rendered < end; rendered++) {
+        var tweet = TWEETS[rendered];
+        var cell = document.createElement('div');
+        cell.setAttribute('data-testid', 'cellInnerDiv');
+        var media = tweet.media ? '<img src="/media/' + tweet.id + '.jpg">' : '';
+        cell.innerHTML = '<article data-testid="tweet"><div data-testid="User-Name">' +
+            '<a href="/' + tweet.author + '/status/' + tweet.id + '"><time datetime="' + tweet.time + '">' +
+            tweet.time + '</time></a></div><div lang="en">' + tweet.text + '</div>' + media + '</article>';
+        timeline.appendChild(cell);
+    }
+}
+window.addEventListener('scroll', function () {
+    var nearBottom = window.innerHeight + window.scrollY >= document.body.scrollHeight - 400;
+    if (!nearBottom || loading || rendered >= TWEETS.length) {
+        return;
+    }
+    loading = true;
+    setTimeout(function () { renderPage(); loading = false; }, LATENCY_MS);
+});
+renderPage();
+</script>
+</body>
+</html>
+'''
+
+def generate_tweets(count, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    tweets = []
+    status_id = 1700000000000000000
+    for index in range(count):
+        status_id -= rng.randint(1000, 100000) << 22  # Newest first, like a real timeline
+        posted = start - timedelta(minutes=index * 7)
+        tweets.append({
+            'id': str(status_id),
+            'author': 'bench',
+            'time': posted.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+            'text': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(8, 40))),
+            'media': rng.random() < 0.2
+        })
+    return tweets
+
+def generate_timeline_page(tweet_count, page_size=20, latency_ms=150, seed=0):
+    return (TIMELINE_TEMPLATE
+            .replace('__TWEETS__', json.dumps(generate_tweets(tweet_count, seed)))
+            .replace('__PAGE_SIZE__', str(page_size))
+            .replace('__LATENCY_MS__', str(latency_ms)))
+
+class TimelineServer:
+    # missing: profile names answered with an empty 404 page, for targets that should fail
+    def __init__(self, page, missing=()):
+        body = page.encode('utf-8')
+        missing = set(missing)
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.strip('/').split('?')[0] in missing:
+                    self.send_error(404)
+                    return
+                is_media = self.path.startswith('/media/')
+                content = MEDIA_BYTES if is_media else body
+                self.send_response(200)
+                self.send_header('Content-Type', 'image/jpeg' if is_media else 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+class MemorySampler:
+    # Samples the RSS of this process and its children (the browser) when psutil is available
+    def __init__(self, interval=0.25):
+        self.interval = interval
+        self.peak_total = None
+        self.stop_event = threading.Event()
+        self.thread = None
+        try:
+            import psutil
+            self.process = psutil.Process()
+        except ImportError:
+            self.process = None
+
+    def start(self):
+        if self.process is not None:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            total = 0
+            for process in [self.process] + self.process.children(recursive=True):
+                try:
+                    total += process.memory_info().rss
+                except Exception:
+                    pass
+            self.peak_total = max(self.peak_total or 0, total)
+            self.stop_event.wait(self.interval)
+
+def peak_python_rss():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # kilobytes on Linux
+
+def measure_ingest(scraper, rows):
+    records = generate_tweets(rows, seed=1)
+    start = time.perf_counter()
+    for record in records:
+        scraper.save_to_database('ingest', {
+            'status_id': record['id'], 'author': record['author'], 'text': record['text'],
+            'created_at': record['time'], 'media': []
+        }, None)
+    scraper.writer.flush()
+    elapsed = time.perf_counter() - start
+    return {'rows': rows, 'seconds': elapsed, 'rows_per_second': rows / elapsed if elapsed > 0 else None}
+
+def run_benchmark(args):
+    page = generate_timeline_page(args.tweets, args.page_size, args.latency_ms, args.seed)
+    workdir = tempfile.mkdtemp(prefix='scraper-bench-')
+    original_dir = os.getcwd()
+    os.chdir(workdir)  # Fresh scraper.db and no saved config
+    sampler = MemorySampler()
+    try:
+        with TimelineServer(page) as server:
+            config = TwitterScraper.load_config()
+            config.update({
+                'base_url': server.url,
+                'headless': not args.show_browser,
+                'proxy_enabled': False,
+                'sentiment_enabled': False,
+                'delay_max': args.scroll_timeout,
+                'extraction_mode': args.extraction_mode,
+                'browser_profile': args.profile,
+                'prune_dom_every': args.prune_every,
+                'prewarm_driver': args.prewarm,
+                'driver_cache_path': os.path.join(original_dir, 'driver_cache.json'),
+                'rate_limits': {},
+                'metrics_enabled': True,
+                'metrics_json_path': None,
+                'metrics_prometheus_path': None,
+                'metrics_port': None
+            })
+            scraper = TwitterScraper(config)
+            scroll_latencies = []
+            first_tweet = []
+
+            wait_for_new_tweets = scraper.wait_for_new_tweets
+
+            def timed_wait():
+                started = time.perf_counter()
+                result = wait_for_new_tweets()
+                scroll_latencies.append(time.perf_counter() - started)
+                return result
+
+            def progress(target, count, total):
+                if not first_tweet:
+                    first_tweet.append(time.perf_counter())
+
+            scraper.wait_for_new_tweets = timed_wait
+            sampler.start()
+            try:
+                started = time.perf_counter()
+                scraper.setup_driver()
+                driver_ready = time.perf_counter()
+                scraper.is_running = True
+                tweets = sum(1 for _ in scraper.iter_tweets('bench', args.tweets, progress=progress))
+                finished = time.perf_counter()
+                transfer_bytes = scraper.driver.execute_script(TRANSFER_SIZE_JS)
+                restarts = []
+                for _ in range(args.restarts):
+                    scraper.quit_driver()
+                    restart_started = time.perf_counter()
+                    scraper.setup_driver()
+                    restarts.append(time.perf_counter() - restart_started)
+                ingest = measure_ingest(scraper, args.ingest_rows)
+                phases = scraper.metrics.snapshot()
+            finally:
+                sampler.stop()
+                scraper.close()
+
+        scrape_seconds = finished - driver_ready
+        scroll_latencies.sort()
+        return {
+            'benchmark': 'scrape_tweets',
+            'started_at': datetime.now(timezone.utc).isoformat(),
+            'parameters': vars(args),
+            'environment': {'python': platform.python_version(), 'platform': platform.platform()},
+            'driver_startup_seconds': driver_ready - started,
+            'driver_restart_seconds': restarts,
+            'tweets': tweets,
+            'scrape_seconds': scrape_seconds,
+            'tweets_per_second': tweets / scrape_seconds if scrape_seconds > 0 else None,
+            'time_to_first_tweet_seconds': first_tweet[0] - driver_ready if first_tweet else None,
+            'scroll_steps': len(scroll_latencies),
+            'scroll_latency_seconds': {
+                'mean': sum(scroll_latencies) / len(scroll_latencies) if scroll_latencies else None,
+                'p50': scroll_latencies[len(scroll_latencies) // 2] if scroll_latencies else None,
+                'max': scroll_latencies[-1] if scroll_latencies else None
+            },
+            'page_transfer_bytes': transfer_bytes,
+            'db_ingest': ingest,
+            'phases': phases,
+            'peak_rss_bytes': {'python': peak_python_rss(), 'python_and_browser': sampler.peak_total}
+        }
+    finally:
+        os.chdir(original_dir)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Offline scrape_tweets benchmark against a synthetic timeline")
+    parser.add_argument('--tweets', type=int, default=1000, help="tweets in the synthetic timeline")
+    parser.add_argument('--page-size', type=int, default=20, help="tweets appended per scroll")
+    parser.add_argument('--latency-ms', type=int, default=150, help="delay before each page is appended")
+    parser.add_argument('--scroll-timeout', type=float, default=2.0, help="seconds to wait for the next page")
+    parser.add_argument('--extraction-mode', choices=('script', 'elements'), default='script')
+    parser.add_argument('--profile', choices=('full', 'light'), default='full',
+                        help="browser profile; light blocks images, media, fonts and analytics")
+    parser.add_argument('--prewarm', action='store_true', help="keep a spare browser started in the background")
+    parser.add_argument('--restarts', type=int, default=0, help="driver restarts to time after the scrape")
+    parser.add_argument('--prune-every', type=int, default=10,
+                        help="remove scraped articles from the page every N scroll steps (0 to keep them)")
+    parser.add_argument('--ingest-rows', type=int, default=20000, help="rows for the database ingest measurement")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--show-browser', action='store_true')
+    parser.add_argument('--output', help="write the JSON result here as well as to stdout")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    result = run_benchmark(args)
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    print(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+import time
+
+STARTED = time.perf_counter()
+
+import argparse
+import json
+import os
+import sys
+import threading
+
+from settings import load_config
+
+IMPORTED = time.perf_counter()
+
+# Seconds allowed from process start until the CLI is ready to work; for scrape runs that
+# includes importing scraper and selenium, but not launching the browser itself
+DEFAULT_STARTUP_BUDGET = 1.0
+
+output_lock = threading.Lock()
+
+def emit(event, **fields):
+    # One JSON object per line on stdout; logs go to stderr and twitter_scraper.log
+    record = {'event': event, 'time': round(time.time(), 3)}
+    record.update(fields)
+    with output_lock:
+        sys.stdout.write(json.dumps(record) + "\n")
+        sys.stdout.flush()
+
+def process_age():
+    # Seconds since the process was created, or None when psutil is not installed
+    try:
+        import psutil
+        return max(0.0, time.time() - psutil.Process().create_time())
+    except Exception:
+        return None
+
+def measure_startup(budget):
+    age = process_age()
+    startup = {
+        # 'process' counts from process creation; 'cli' only from the first line of cli.py
+        'clock': 'cli' if age is None else 'process',
+        'import_seconds': round(IMPORTED - STARTED, 4),
+        'startup_seconds': round(time.perf_counter() - STARTED if age is None else age, 4),
+        'budget_seconds': budget,
+        'modules': sorted(name for name in ('tkinter', 'ttkthemes', 'textblob', 'webdriver_manager', 'selenium')
+                          if name in sys.modules)
+    }
+    startup['within_budget'] = startup['startup_seconds'] <= budget
+    return startup
+
+def read_targets(args):
+    targets = list(args.target or [])
+    if args.targets:
+        handle = sys.stdin if args.targets == '-' else open(args.targets, 'r', encoding='utf-8')
+        with handle:
+            for line in handle:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    targets.append(line.lstrip('@'))
+    # Keep the order but drop repeats
+    return list(dict.fromkeys(targets))
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Headless batch runner for Twitter Scraper Pro")
+    parser.add_argument('--targets', help="file with one username per line ('-' for stdin)")
+    parser.add_argument('--target', action='append', help="username to scrape, can be repeated")
+    parser.add_argument('--query', action='append',
+                        help="search query or #hashtag to collect, split into date windows over several tabs")
+    parser.add_argument('--search-since', help="oldest day for --query (default: search_days ago)")
+    parser.add_argument('--search-until', help="day after the newest for --query (default: tomorrow)")
+    parser.add_argument('--count', type=int, help="tweets per target (default: max_tweets from the config)")
+    parser.add_argument('--mode', choices=('full', 'new', 'backfill'), default='full')
+    parser.add_argument('--sessions', type=int, help="concurrent browser sessions (default: max_sessions)")
+    parser.add_argument('--account', help="login username; the saved session is reused when still valid")
+    parser.add_argument('--password-env', default='TWITTER_PASSWORD',
+                        help="environment variable holding the account password")
+    parser.add_argument('--no-headless', action='store_true', help="show the browser window")
+    parser.add_argument('--no-sentiment', action='store_true', help="skip sentiment scoring for this run")
+    parser.add_argument('--metrics-json', metavar='PATH', help="append a per-run timing summary to PATH")
+    parser.add_argument('--metrics-prometheus', metavar='PATH', help="write Prometheus text metrics to PATH")
+    parser.add_argument('--metrics-port', type=int, help="serve Prometheus metrics on this port during the run")
+    parser.add_argument('--startup-budget', type=float, default=DEFAULT_STARTUP_BUDGET,
+                        help="warn when startup takes longer than this many seconds")
+    parser.add_argument('--check-startup', action='store_true',
+                        help="only measure startup and exit non-zero if it is over budget")
+    parser.add_argument('--export', metavar='PATH', help="stream scraped_data to PATH after the run (or on its own)")
+    parser.add_argument('--export-format', choices=('jsonl', 'csv', 'parquet'), help="default: from the file name")
+    parser.add_argument('--export-compression', choices=('gzip', 'zstd'), help="default: from the file name")
+    parser.add_argument('--export-username', help="only export tweets scraped for this target")
+    parser.add_argument('--since', help="only export tweets from this date or time on (UTC)")
+    parser.add_argument('--until', help="only export tweets before this date or time (UTC)")
+    parser.add_argument('--incremental', action='store_true', help="only export rows added since the last export")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.target or args.targets or args.query:
+        # Only scrape runs load selenium, and --check-startup with targets pays for it the same way
+        from scraper import TwitterScraper, ScrapeScheduler
+    startup = measure_startup(args.startup_budget)
+    emit('startup', **startup)
+    if args.check_startup:
+        return 0 if startup['within_budget'] else 1
+
+    targets = read_targets(args)
+    queries = list(dict.fromkeys(args.query or []))
+    if not targets and not queries:
+        if args.export:
+            return run_export(args)
+        emit('error', message="No targets given, use --target, --targets or --query")
+        return 2
+
+    credentials = None
+    if args.account:
+        password = os.environ.get(args.password_env)
+        if not password:
+            emit('error', message=f"Set {args.password_env} to log in as {args.account}")
+            return 2
+        credentials = (args.account, password)
+
+    config = load_config()
+    config['headless'] = not args.no_headless
+    if args.no_sentiment:
+        # Also keeps TextBlob from ever being imported
+        config['sentiment_enabled'] = False
+    if args.metrics_json or args.metrics_prometheus or args.metrics_port:
+        config['metrics_enabled'] = True
+        config['metrics_json_path'] = args.metrics_json
+        config['metrics_prometheus_path'] = args.metrics_prometheus
+        config['metrics_port'] = args.metrics_port
+    scraper = TwitterScraper(config)
+    count = args.count or scraper.config['max_tweets']
+
+    def progress(target, scraped, total):
+        emit('progress', target=target, scraped=scraped, total=total)
+
+    status = 0
+    try:
+        if targets:
+            scheduler = ScrapeScheduler(scraper, targets, count, sessions=args.sessions, credentials=credentials,
+                                        mode=args.mode, progress=progress)
+            emit('start', targets=len(targets), count=count, mode=args.mode, sessions=scheduler.sessions)
+            try:
+                summary = scheduler.run()
+            except KeyboardInterrupt:
+                scheduler.stop()
+                scheduler.wait()
+                emit('stopped')
+                return 130
+            emit('summary', **summary)
+            status = 1 if summary['failed'] else 0
+        for query in queries:
+            if not run_search(args, scraper, query, count, credentials, progress):
+                status = 1
+        if args.export and config['sentiment_enabled']:
+            # Score what this run collected so the export does not carry NULL sentiment
+            scraper.sentiment.backfill()
+    except KeyboardInterrupt:
+        scraper.is_running = False
+        emit('stopped')
+        return 130
+    finally:
+        scraper.close()
+    if args.export:
+        status = run_export(args, hold_unscored=config['sentiment_enabled']) or status
+    return status
+
+def run_search(args, scraper, query, count, credentials, progress):
+    # Search fan-out uses tabs of one browser, so it runs on the main scraper rather than the scheduler
+    emit('start', query=query, count=count, tabs=scraper.config['search_tabs'])
+    scraper.metrics.begin_run()
+    started = time.monotonic()
+    if credentials:
+        if not scraper.ensure_logged_in(*credentials):
+            emit('error', query=query, message="Login failed")
+            return False
+    else:
+        scraper.setup_driver()
+    scraper.is_running = True
+    # Counted as they stream past, the records themselves are already in the database
+    tweets = sum(1 for _ in scraper.iter_search(query, count, args.search_since, args.search_until, progress=progress))
+    scraper.is_running = False
+    summary = {'query': query, 'tweets': tweets, 'elapsed': time.monotonic() - started}
+    if scraper.last_error is not None:
+        summary['error'] = str(scraper.last_error)
+    scraper.metrics.report(**summary)
+    summary['metrics'] = scraper.metrics.snapshot()
+    emit('summary', **summary)
+    return scraper.last_error is None
+
+def run_export(args, hold_unscored=None):
+    from exporter import TweetExporter
+
+    if hold_unscored is None:
+        hold_unscored = load_config()['sentiment_enabled']
+
+    def progress(rows):
+        emit('export_progress', rows=rows)
+
+    try:
+        result = TweetExporter().export(
+            args.export, fmt=args.export_format, compression=args.export_compression,
+            username=args.export_username, since=args.since, until=args.until,
+            incremental=args.incremental, progress=progress, hold_unscored=hold_unscored
+        )
+    except Exception as e:
+        emit('error', message=f"Export failed: {str(e)}")
+        return 1
+    emit('export', **result)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
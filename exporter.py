@@ -0,0 +1,215 @@
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+import shutil
+import sqlite3
+
+from settings import DB_PATH
+
+EXPORT_COLUMNS = [
+    'id', 'status_id', 'username', 'author', 'tweet_text', 'sentiment', 'created_at', 'timestamp',
+    'media_urls', 'reply_count', 'retweet_count', 'like_count', 'quote_count', 'view_count'
+]
+
+SENTIMENT_COLUMNS = ['id', 'status_id', 'username', 'created_at', 'sentiment']
+
+FORMATS = ('jsonl', 'csv', 'parquet')
+COMPRESSIONS = (None, 'gzip', 'zstd')
+
+def guess_format(path):
+    name = path.lower()
+    for suffix in ('.gz', '.zst'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    for fmt in FORMATS:
+        if name.endswith('.' + fmt) or (fmt == 'jsonl' and name.endswith('.json')):
+            return fmt
+    return 'jsonl'
+
+def guess_compression(path):
+    if path.lower().endswith('.gz'):
+        return 'gzip'
+    if path.lower().endswith('.zst'):
+        return 'zstd'
+    return None
+
+def _open_text(path, compression):
+    if compression == 'gzip':
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("zstd compression needs the 'zstandard' package")
+        raw = open(path, 'wb')
+        return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(raw), encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+class JsonLinesWriter:
+    def __init__(self, path, columns, compression, header=True):
+        self.columns = columns
+        self.handle = _open_text(path, compression)
+
+    def write(self, rows):
+        for row in rows:
+            record = dict(zip(self.columns, row))
+            if record.get('media_urls'):
+                record['media_urls'] = json.loads(record['media_urls'])
+            self.handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def close(self):
+        self.handle.close()
+
+class CsvWriter:
+    def __init__(self, path, columns, compression, header=True):
+        self.handle = _open_text(path, compression)
+        self.writer = csv.writer(self.handle)
+        if header:
+            self.writer.writerow(columns)
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.handle.close()
+
+class ParquetWriter:
+    def __init__(self, path, columns, compression, header=True):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("Parquet export needs the 'pyarrow' package")
+        self.pyarrow = pyarrow
+        self.columns = columns
+        # Parquet compresses per column chunk, so the codec goes to the writer instead of the file
+        self.schema = self._schema()
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema, compression=compression or 'snappy')
+
+    def _schema(self):
+        types = {
+            'id': self.pyarrow.int64(),
+            'sentiment': self.pyarrow.float64(),
+            'reply_count': self.pyarrow.int64(),
+            'retweet_count': self.pyarrow.int64(),
+            'like_count': self.pyarrow.int64(),
+            'quote_count': self.pyarrow.int64(),
+            'view_count': self.pyarrow.int64()
+        }
+        return self.pyarrow.schema([(name, types.get(name, self.pyarrow.string())) for name in self.columns])
+
+    def write(self, rows):
+        arrays = list(zip(*rows))
+        self.writer.write_table(self.pyarrow.Table.from_arrays(
+            [self.pyarrow.array(values, type=field.type) for values, field in zip(arrays, self.schema)],
+            schema=self.schema
+        ))
+
+    def close(self):
+        self.writer.close()
+
+WRITERS = {'jsonl': JsonLinesWriter, 'csv': CsvWriter, 'parquet': ParquetWriter}
+
+class TweetExporter:
+    def __init__(self, db_path=DB_PATH, chunk_size=5000):
+        self.db_path = db_path
+        self.chunk_size = chunk_size
+
+    def export(self, path, fmt=None, compression=None, columns=None, username=None, since=None, until=None,
+               incremental=False, name=None, progress=None, hold_unscored=False):
+        fmt = fmt or guess_format(path)
+        compression = compression or guess_compression(path)
+        columns = columns or EXPORT_COLUMNS
+        if fmt not in WRITERS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {compression}")
+
+        # Own connection so exports can run on a background thread next to the scraper
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS export_state (
+                    name TEXT PRIMARY KEY,
+                    last_id INTEGER,
+                    exported_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            state_name = name or os.path.basename(path)
+            # Incremental runs append to JSONL/CSV; gzip members and zstd frames concatenate cleanly
+            append = incremental and os.path.exists(path)
+            if append and fmt == 'parquet':
+                raise ValueError("Parquet files cannot be appended to, use a new path for each incremental export")
+            after_id = 0
+            if incremental:
+                row = conn.execute("SELECT last_id FROM export_state WHERE name = ?", (state_name,)).fetchone()
+                after_id = row[0] if row else 0
+
+            conditions = ["id > ?"]
+            params = [after_id]
+            if incremental and hold_unscored and 'sentiment' in columns:
+                # The marker only moves forward, so stop before the first row still waiting for its score
+                row = conn.execute(
+                    "SELECT MIN(id) FROM scraped_data WHERE sentiment IS NULL AND id > ?", (after_id,)
+                ).fetchone()
+                if row[0] is not None:
+                    logging.info(f"Holding back rows from id {row[0]} until their sentiment is scored")
+                    conditions.append("id < ?")
+                    params.append(row[0])
+            if username:
+                conditions.append("username = ?")
+                params.append(username)
+            if since:
+                conditions.append("datetime(COALESCE(created_at, timestamp)) >= datetime(?)")
+                params.append(since)
+            if until:
+                conditions.append("datetime(COALESCE(created_at, timestamp)) < datetime(?)")
+                params.append(until)
+            column_list = ', '.join(columns)
+            cursor = conn.execute(
+                f"SELECT {column_list} FROM scraped_data WHERE {' AND '.join(conditions)} ORDER BY id", params
+            )
+
+            # Write to a temporary file so a failed export never advances the incremental marker
+            temp_path = path + '.part'
+            writer = WRITERS[fmt](temp_path, columns, compression, header=not append)
+            total = 0
+            last_id = after_id
+            id_index = columns.index('id') if 'id' in columns else None
+            try:
+                while True:
+                    rows = cursor.fetchmany(self.chunk_size)
+                    if not rows:
+                        break
+                    writer.write(rows)
+                    total += len(rows)
+                    if id_index is not None:
+                        last_id = rows[-1][id_index]
+                    if progress:
+                        progress(total)
+            except Exception:
+                writer.close()
+                os.remove(temp_path)
+                raise
+            writer.close()
+            if append:
+                with open(temp_path, 'rb') as part, open(path, 'ab') as target:
+                    shutil.copyfileobj(part, target)
+                os.remove(temp_path)
+            else:
+                os.replace(temp_path, path)
+
+            if incremental and id_index is not None:
+                conn.execute(
+                    "INSERT INTO export_state (name, last_id, exported_at) VALUES (?, ?, CURRENT_TIMESTAMP) "
+                    "ON CONFLICT(name) DO UPDATE SET last_id = excluded.last_id, exported_at = CURRENT_TIMESTAMP",
+                    (state_name, last_id)
+                )
+                conn.commit()
+            logging.info(f"Exported {total} rows to {path}")
+            return {'path': path, 'rows': total, 'last_id': last_id}
+        finally:
+            conn.close()
@@ -0,0 +1,481 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, scrolledtext, filedialog
+from ttkthemes import ThemedTk
+import threading
+import queue
+from scraper import TwitterScraper
+from exporter import TweetExporter, SENTIMENT_COLUMNS
+
+# Worker threads only enqueue UI events; the Tk loop drains them on this interval
+UI_POLL_MS = 100
+MAX_EVENTS_PER_TICK = 1000
+# The output log keeps only the most recent lines
+LOG_MAX_LINES = 2000
+
+def format_sentiment(value):
+    return "-" if value is None else f"{value:.2f}"
+
+class TwitterScraperGUI(ThemedTk):
+    def __init__(self):
+        super().__init__()
+        self.title("Twitter Scraper Pro")
+        self.geometry("1000x800")
+        self.set_theme("arc")
+        
+        self.scraper = TwitterScraper()
+        self.worker = None
+        self.ui_events = queue.Queue()
+        self.create_widgets()
+        self.load_config()
+        self.update_analytics()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.after(UI_POLL_MS, self.drain_ui_events)
+
+    def post(self, kind, *args):
+        # Safe to call from any thread
+        self.ui_events.put((kind, args))
+
+    def drain_ui_events(self):
+        lines = []
+        progress = None
+        calls = []
+        for _ in range(MAX_EVENTS_PER_TICK):
+            try:
+                kind, args = self.ui_events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'status':
+                lines.append(args[0])
+            elif kind == 'progress':
+                progress = args  # Only the latest count matters
+            elif kind == 'call':
+                calls.append(args[0])
+
+        if lines:
+            self.status_label.config(text=f"Status: {lines[-1]}")
+            self.output_text.insert(tk.END, "\n".join(lines[-LOG_MAX_LINES:]) + "\n")
+            excess = int(self.output_text.index('end-1c').split('.')[0]) - 1 - LOG_MAX_LINES
+            if excess > 0:
+                self.output_text.delete('1.0', f'{excess + 1}.0')
+            self.output_text.see(tk.END)
+        if progress is not None:
+            count, total = progress
+            self.progress["maximum"] = max(total, 1)
+            self.progress["value"] = min(count, total)
+        for call in calls:
+            call()
+        self.after(UI_POLL_MS, self.drain_ui_events)
+
+    def on_close(self):
+        self.scraper.is_running = False
+        self.scraper.close()
+        self.destroy()
+
+    def create_widgets(self):
+        # Notebook for tabs
+        self.notebook = ttk.Notebook(self)
+        self.notebook.pack(fill=tk.BOTH, expand=True)
+
+        # Create tabs
+        self.main_tab = ttk.Frame(self.notebook)
+        self.settings_tab = ttk.Frame(self.notebook)
+        self.analytics_tab = ttk.Frame(self.notebook)
+        self.search_tab = ttk.Frame(self.notebook)
+        self.accounts_tab = ttk.Frame(self.notebook)
+
+        self.notebook.add(self.main_tab, text="Main")
+        self.notebook.add(self.settings_tab, text="Settings")
+        self.notebook.add(self.analytics_tab, text="Analytics")
+        self.notebook.add(self.search_tab, text="Search")
+        self.notebook.add(self.accounts_tab, text="Accounts")
+
+        # Create tab contents
+        self.create_main_tab()
+        self.create_settings_tab()
+        self.create_analytics_tab()
+        self.create_search_tab()
+        self.create_accounts_tab()
+
+    def create_main_tab(self):
+        # Login section
+        ttk.Label(self.main_tab, text="Twitter Login", font=("Arial", 12, "bold")).pack(pady=5)
+        
+        login_frame = ttk.Frame(self.main_tab)
+        login_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(login_frame, text="Username:").pack(side=tk.LEFT)
+        self.username_entry = ttk.Entry(login_frame)
+        self.username_entry.pack(side=tk.LEFT, padx=5)
+        
+        ttk.Label(login_frame, text="Password:").pack(side=tk.LEFT)
+        self.password_entry = ttk.Entry(login_frame, show="*")
+        self.password_entry.pack(side=tk.LEFT, padx=5)
+
+        # Scraping options
+        ttk.Label(self.main_tab, text="\nScraping Options", font=("Arial", 12, "bold")).pack()
+        
+        options_frame = ttk.Frame(self.main_tab)
+        options_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        self.scrape_type = tk.StringVar(value="tweets")
+        ttk.Radiobutton(options_frame, text="User Tweets", variable=self.scrape_type, value="tweets").pack(side=tk.LEFT, padx=5)
+        ttk.Radiobutton(options_frame, text="Hashtag Tweets", variable=self.scrape_type, value="hashtag").pack(side=tk.LEFT, padx=5)
+        ttk.Radiobutton(options_frame, text="Following", variable=self.scrape_type, value="following").pack(side=tk.LEFT, padx=5)
+        ttk.Radiobutton(options_frame, text="Media", variable=self.scrape_type, value="media").pack(side=tk.LEFT, padx=5)
+
+        # Target and number of items
+        target_frame = ttk.Frame(self.main_tab)
+        target_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(target_frame, text="Target:").pack(side=tk.LEFT)
+        self.target_entry = ttk.Entry(target_frame)
+        self.target_entry.pack(side=tk.LEFT, padx=5)
+        
+        ttk.Label(target_frame, text="Number of items:").pack(side=tk.LEFT)
+        self.num_items_entry = ttk.Entry(target_frame)
+        self.num_items_entry.pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(target_frame, text="Mode:").pack(side=tk.LEFT)
+        self.scrape_mode = tk.StringVar(value="full")
+        ttk.Combobox(target_frame, textvariable=self.scrape_mode, values=("full", "new", "backfill"),
+                     state="readonly", width=10).pack(side=tk.LEFT, padx=5)
+
+        # Control buttons
+        control_frame = ttk.Frame(self.main_tab)
+        control_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        self.start_button = ttk.Button(control_frame, text="Start Scraping", command=self.start_scraping)
+        self.start_button.pack(side=tk.LEFT, padx=5)
+        
+        self.stop_button = ttk.Button(control_frame, text="Stop Scraping", command=self.stop_scraping, state=tk.DISABLED)
+        self.stop_button.pack(side=tk.LEFT, padx=5)
+
+        # Progress bar
+        self.progress = ttk.Progressbar(self.main_tab, orient="horizontal", length=400, mode="determinate")
+        self.progress.pack(pady=10)
+
+        # Status and output
+        self.status_label = ttk.Label(self.main_tab, text="Status: Ready")
+        self.status_label.pack()
+
+        self.output_text = scrolledtext.ScrolledText(self.main_tab, height=15)
+        self.output_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+    def create_settings_tab(self):
+        # Delay settings
+        ttk.Label(self.settings_tab, text="Delay Settings", font=("Arial", 12, "bold")).pack(pady=5)
+        
+        delay_frame = ttk.Frame(self.settings_tab)
+        delay_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(delay_frame, text="Maximum Delay (seconds):").pack(side=tk.LEFT)
+        self.max_delay_entry = ttk.Entry(delay_frame)
+        self.max_delay_entry.pack(side=tk.LEFT, padx=5)
+
+        # Proxy settings
+        ttk.Label(self.settings_tab, text="\nProxy Settings", font=("Arial", 12, "bold")).pack()
+        
+        self.proxy_var = tk.BooleanVar(value=self.scraper.config['proxy_enabled'])
+        ttk.Checkbutton(self.settings_tab, text="Enable Proxies", variable=self.proxy_var).pack(pady=5)
+
+        proxy_frame = ttk.Frame(self.settings_tab)
+        proxy_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(proxy_frame, text="Proxies (ip:port:username:password):").pack()
+        self.proxies_text = tk.Text(proxy_frame, height=5)
+        self.proxies_text.pack(fill=tk.X, padx=5)
+        for proxy in self.scraper.config['proxies']:
+            self.proxies_text.insert(tk.END, proxy + "\n")
+
+        # Save settings button
+        ttk.Button(self.settings_tab, text="Save Settings", command=self.save_settings).pack(pady=10)
+
+    def create_analytics_tab(self):
+        # Statistics
+        ttk.Label(self.analytics_tab, text="Scraping Statistics", font=("Arial", 12, "bold")).pack(pady=5)
+        
+        self.total_tweets_label = ttk.Label(self.analytics_tab, text="Total Tweets Scraped: 0")
+        self.total_tweets_label.pack()
+        
+        self.avg_sentiment_label = ttk.Label(self.analytics_tab, text="Average Sentiment: 0.00")
+        self.avg_sentiment_label.pack()
+
+        # Per-target statistics
+        ttk.Label(self.analytics_tab, text="\nPer Target", font=("Arial", 12, "bold")).pack()
+        self.user_stats_tree = ttk.Treeview(self.analytics_tab, columns=("tweets", "mean", "stddev"), height=6)
+        self.user_stats_tree.heading("#0", text="Target")
+        self.user_stats_tree.heading("tweets", text="Tweets")
+        self.user_stats_tree.heading("mean", text="Avg Sentiment")
+        self.user_stats_tree.heading("stddev", text="Std Dev")
+        self.user_stats_tree.pack(fill=tk.X, padx=5, pady=5)
+        self.user_stats_tree.bind("<<TreeviewSelect>>", lambda event: self.update_timeseries())
+
+        # Daily series for the selected target, or all targets
+        ttk.Label(self.analytics_tab, text="\nDaily Activity", font=("Arial", 12, "bold")).pack()
+        self.timeseries_tree = ttk.Treeview(self.analytics_tab, columns=("tweets", "mean"), height=8)
+        self.timeseries_tree.heading("#0", text="Day")
+        self.timeseries_tree.heading("tweets", text="Tweets")
+        self.timeseries_tree.heading("mean", text="Avg Sentiment")
+        self.timeseries_tree.pack(fill=tk.X, padx=5, pady=5)
+
+        ttk.Button(self.analytics_tab, text="Refresh", command=self.update_analytics).pack(pady=5)
+
+        # Export buttons
+        ttk.Button(self.analytics_tab, text="Export Tweets", command=self.export_tweets).pack(pady=5)
+        ttk.Button(self.analytics_tab, text="Export Sentiments", command=self.export_sentiments).pack(pady=5)
+
+    def create_search_tab(self):
+        ttk.Label(self.search_tab, text="Search Scraped Tweets", font=("Arial", 12, "bold")).pack(pady=5)
+
+        query_frame = ttk.Frame(self.search_tab)
+        query_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        ttk.Label(query_frame, text="Keywords:").pack(side=tk.LEFT)
+        self.search_entry = ttk.Entry(query_frame, width=40)
+        self.search_entry.pack(side=tk.LEFT, padx=5)
+        self.search_entry.bind("<Return>", lambda event: self.run_search())
+
+        self.phrase_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(query_frame, text="Exact phrase", variable=self.phrase_var).pack(side=tk.LEFT, padx=5)
+
+        filter_frame = ttk.Frame(self.search_tab)
+        filter_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        ttk.Label(filter_frame, text="Target:").pack(side=tk.LEFT)
+        self.search_user_entry = ttk.Entry(filter_frame, width=15)
+        self.search_user_entry.pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(filter_frame, text="From (YYYY-MM-DD):").pack(side=tk.LEFT)
+        self.search_since_entry = ttk.Entry(filter_frame, width=12)
+        self.search_since_entry.pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(filter_frame, text="Until:").pack(side=tk.LEFT)
+        self.search_until_entry = ttk.Entry(filter_frame, width=12)
+        self.search_until_entry.pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(filter_frame, text="Search", command=self.run_search).pack(side=tk.LEFT, padx=5)
+
+        self.search_status_label = ttk.Label(self.search_tab, text="")
+        self.search_status_label.pack()
+
+        self.search_results = ttk.Treeview(self.search_tab, columns=("username", "created", "sentiment", "text"),
+                                           show="headings")
+        self.search_results.heading("username", text="Target")
+        self.search_results.heading("created", text="Posted")
+        self.search_results.heading("sentiment", text="Sentiment")
+        self.search_results.heading("text", text="Tweet")
+        self.search_results.column("username", width=120, stretch=False)
+        self.search_results.column("created", width=160, stretch=False)
+        self.search_results.column("sentiment", width=80, stretch=False)
+        self.search_results.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+    def run_search(self):
+        query = self.search_entry.get().strip()
+        if not query:
+            return
+        try:
+            results = self.scraper.search_tweets(
+                query,
+                username=self.search_user_entry.get().strip() or None,
+                since=self.search_since_entry.get().strip() or None,
+                until=self.search_until_entry.get().strip() or None,
+                limit=200,
+                phrase=self.phrase_var.get()
+            )
+        except Exception as e:
+            messagebox.showerror("Error", f"Search failed: {str(e)}")
+            return
+        self.search_results.delete(*self.search_results.get_children())
+        for result in results:
+            self.search_results.insert("", tk.END, values=(
+                result['username'], result['created_at'] or "", format_sentiment(result['sentiment']),
+                " ".join(result['tweet_text'].split())
+            ))
+        self.search_status_label.config(text=f"{len(results)} results")
+
+    def create_accounts_tab(self):
+        # Account management
+        ttk.Label(self.accounts_tab, text="Account Management", font=("Arial", 12, "bold")).pack(pady=5)
+        
+        self.accounts_text = tk.Text(self.accounts_tab, height=10)
+        self.accounts_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        ttk.Button(self.accounts_tab, text="Add Account", command=self.add_account).pack(pady=5)
+        ttk.Button(self.accounts_tab, text="Remove Account", command=self.remove_account).pack(pady=5)
+
+    def load_config(self):
+        self.max_delay_entry.delete(0, tk.END)
+        self.max_delay_entry.insert(0, str(self.scraper.config['delay_max']))
+        self.proxy_var.set(self.scraper.config['proxy_enabled'])
+        self.proxies_text.delete(1.0, tk.END)
+        for proxy in self.scraper.config['proxies']:
+            self.proxies_text.insert(tk.END, proxy + "\n")
+
+    def save_settings(self):
+        try:
+            self.scraper.config['delay_max'] = float(self.max_delay_entry.get())
+            self.scraper.config['proxy_enabled'] = self.proxy_var.get()
+            self.scraper.config['proxies'] = [line.strip() for line in self.proxies_text.get(1.0, tk.END).split('\n') if line.strip()]
+            self.scraper.save_config()
+            messagebox.showinfo("Success", "Settings saved successfully")
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid number for the delay")
+
+    def update_status(self, message):
+        self.post('status', message)
+
+    def update_progress(self, target, count, total):
+        self.post('progress', count, total)
+
+    def finish_scraping(self):
+        self.start_button.config(state=tk.NORMAL)
+        self.stop_button.config(state=tk.DISABLED)
+
+    def start_scraping(self):
+        # A stopped worker keeps the driver until its loop notices the stop, so wait for the thread itself
+        if self.scraper.is_running or (self.worker is not None and self.worker.is_alive()):
+            messagebox.showwarning("Warning", "Scraper is already running")
+            return
+
+        username = self.username_entry.get()
+        password = self.password_entry.get()
+        target = self.target_entry.get()
+        num_items = int(self.num_items_entry.get() or 10)
+        scrape_type = self.scrape_type.get()
+
+        if not username or not password or not target:
+            messagebox.showerror("Error", "Please fill all required fields")
+            return
+
+        self.scraper.is_running = True
+        self.start_button.config(state=tk.DISABLED)
+        self.stop_button.config(state=tk.NORMAL)
+        self.progress["maximum"] = num_items
+        self.progress["value"] = 0
+        
+        self.worker = threading.Thread(target=self.run_scraping, args=(username, password, target, num_items, scrape_type, self.scrape_mode.get()))
+        self.worker.start()
+
+    def stop_scraping(self):
+        self.scraper.is_running = False
+        self.stop_button.config(state=tk.DISABLED)
+        # The worker thread flushes, releases the driver and re-enables Start once the scrape loop sees the stop
+        self.update_status("Stopping after the current step...")
+
+    def run_scraping(self, username, password, target, num_items, scrape_type, mode="full"):
+        self.scraper.metrics.begin_run()
+        try:
+            if self.scraper.ensure_logged_in(username, password):
+                self.update_status("Logged in successfully")
+                
+                if scrape_type == "tweets":
+                    # Counted as they stream past, the records themselves are already in the database
+                    tweets = sum(1 for _ in self.scraper.iter_tweets(target, num_items, self.update_status, mode,
+                                                                     self.update_progress))
+                    if tweets:
+                        self.update_status(f"Scraped {tweets} tweets")
+                        self.post('call', self.update_analytics)
+                
+                elif scrape_type == "hashtag":
+                    # A bare word is treated as a hashtag, anything else as a search query
+                    query = target if target.startswith('#') or ' ' in target else f"#{target}"
+                    tweets = sum(1 for _ in self.scraper.iter_search(query, num_items, callback=self.update_status,
+                                                                     progress=self.update_progress))
+                    if tweets:
+                        self.update_status(f"Scraped {tweets} tweets for {query}")
+                        self.post('call', self.update_analytics)
+                
+                elif scrape_type == "following":
+                    # Implement following scraping
+                    pass
+                
+                elif scrape_type == "media":
+                    # The target's tweets that carry media, with every image and video downloaded
+                    query = f"from:{target.lstrip('@')} filter:media"
+                    tweets = sum(1 for _ in self.scraper.iter_search(query, num_items, callback=self.update_status,
+                                                                     progress=self.update_progress,
+                                                                     download_media=True))
+                    if tweets:
+                        self.update_status(f"Scraped {tweets} media tweets from {target}, downloading in the background")
+                        self.post('call', self.update_analytics)
+            else:
+                self.update_status("Login failed")
+        except Exception as e:
+            self.update_status(f"Error: {str(e)}")
+        finally:
+            self.scraper.is_running = False
+            self.update_status("Scraping completed")
+            if not self.scraper.config['keep_driver_alive']:
+                self.scraper.quit_driver()
+            self.scraper.metrics.report(target=target, scrape_type=scrape_type, mode=mode)
+            self.post('call', self.finish_scraping)
+
+    def update_analytics(self):
+        total_tweets, avg_sentiment = self.scraper.get_scraping_stats()
+        self.total_tweets_label.config(text=f"Total Tweets Scraped: {total_tweets}")
+        self.avg_sentiment_label.config(text=f"Average Sentiment: {avg_sentiment or 0:.2f}")
+
+        self.user_stats_tree.delete(*self.user_stats_tree.get_children())
+        self.user_stats_rows = {}
+        for stats in self.scraper.get_user_stats():
+            item = self.user_stats_tree.insert("", tk.END, text=stats['username'] or "(unknown)", values=(
+                stats['tweets'], format_sentiment(stats['mean_sentiment']), format_sentiment(stats['stddev_sentiment'])
+            ))
+            self.user_stats_rows[item] = stats['username']
+        self.update_timeseries()
+
+    def update_timeseries(self):
+        selection = self.user_stats_tree.selection()
+        username = self.user_stats_rows.get(selection[0]) if selection else None
+        self.timeseries_tree.delete(*self.timeseries_tree.get_children())
+        for entry in self.scraper.get_timeseries(username, 'day'):
+            self.timeseries_tree.insert("", tk.END, text=entry['bucket'], values=(
+                entry['tweets'], format_sentiment(entry['mean_sentiment'])
+            ))
+
+    def export_tweets(self):
+        self.start_export("Tweets", None)
+
+    def export_sentiments(self):
+        self.start_export("Sentiments", SENTIMENT_COLUMNS)
+
+    def start_export(self, label, columns):
+        path = filedialog.asksaveasfilename(
+            title=f"Export {label}",
+            defaultextension=".jsonl",
+            filetypes=[("JSON Lines", "*.jsonl"), ("CSV", "*.csv"), ("Parquet", "*.parquet"),
+                       ("Gzip JSON Lines", "*.jsonl.gz"), ("Gzip CSV", "*.csv.gz"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        # Exports stream from their own connection, so keep them off the Tk thread
+        threading.Thread(target=self.run_export, args=(label, path, columns), daemon=True).start()
+
+    def run_export(self, label, path, columns):
+        try:
+            if self.scraper.config['sentiment_enabled']:
+                # Score anything still queued so the file does not carry NULL sentiment
+                self.scraper.sentiment.backfill()
+            self.scraper.writer.flush()
+            result = TweetExporter().export(path, columns=columns)
+            self.post('call', lambda: messagebox.showinfo("Success", f"{label} exported successfully ({result['rows']} rows)"))
+        except Exception as e:
+            message = str(e)
+            self.post('call', lambda: messagebox.showerror("Error", f"Export failed: {message}"))
+
+    def add_account(self):
+        username = self.username_entry.get()
+        password = self.password_entry.get()
+        if username and password:
+            self.accounts_text.insert(tk.END, f"{username}:{password}\n")
+            self.update_status(f"Added account: {username}")
+
+    def remove_account(self):
+        selection = self.accounts_text.tag_ranges(tk.SEL)
+        if selection:
+            self.accounts_text.delete(selection[0], selection[1])
+            self.update_status("Removed selected account")
+
+if __name__ == "__main__":
+    app = TwitterScraperGUI()
+    app.mainloop()
@@ -0,0 +1,206 @@
+import hashlib
+import logging
+import mimetypes
+import os
+import queue
+import sqlite3
+import threading
+from collections import OrderedDict
+from urllib.parse import urlparse, parse_qs
+
+from metrics import NULL_METRICS
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+def media_kind(url):
+    parsed = urlparse(url)
+    if parsed.hostname == 'video.twimg.com' or parsed.path.endswith(('.mp4', '.m3u8')):
+        return 'video'
+    return 'image'
+
+def media_extension(url, content_type=None):
+    # The served type wins so identical bytes always land on the same path
+    if content_type:
+        extension = mimetypes.guess_extension(content_type.split(';')[0].strip())
+        if extension:
+            return extension
+    parsed = urlparse(url)
+    extension = os.path.splitext(parsed.path)[1]
+    if extension:
+        return extension.lower()
+    # pbs.twimg.com serves images as /media/<id>?format=jpg&name=small
+    fmt = parse_qs(parsed.query).get('format')
+    return '.' + fmt[0] if fmt else ''
+
+class MediaDownloader:
+    # Sentinel understood by the download workers
+    _STOP = object()
+
+    def __init__(self, db_path, writer, media_dir='media', workers=4, per_host=2, retries=3, backoff=0.5,
+                 timeout=30, max_queue=5000, cache_size=10000, metrics=None):
+        self.db_path = db_path
+        self.writer = writer
+        self.media_dir = media_dir
+        self.workers = workers
+        self.per_host = per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self.metrics = metrics or NULL_METRICS
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.pool = None
+        self.threads = []
+        self.lock = threading.Lock()
+        # url -> (sha256, path, size, content_type) for the most recently stored URLs; older ones come from the media table
+        self.known = OrderedDict()
+        # (status_id, url) pairs waiting in the queue or being downloaded
+        self.queued = set()
+        # url -> Event set once the worker fetching it has finished, so other workers wait instead of downloading it too
+        self.in_flight = {}
+
+    def start(self):
+        with self.lock:
+            if self.threads:
+                return
+            import urllib3
+            # block=True caps open connections per host at per_host, which is the per-host concurrency limit
+            self.pool = urllib3.PoolManager(num_pools=16, maxsize=self.per_host, block=True)
+            self.retry = urllib3.Retry(total=self.retries, backoff_factor=self.backoff,
+                                       status_forcelist=RETRY_STATUSES, raise_on_status=False)
+            os.makedirs(self.media_dir, exist_ok=True)
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"media-{index}", daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def submit(self, status_id, url):
+        # Never blocks the scroll loop: a full queue drops the URL instead
+        key = (status_id, url)
+        with self.lock:
+            if key in self.queued:
+                return False
+            self.queued.add(key)
+        try:
+            self.queue.put_nowait(key)
+            return True
+        except queue.Full:
+            with self.lock:
+                self.queued.discard(key)
+            logging.warning(f"Media queue full, skipped {url}")
+            self.metrics.incr('media_dropped')
+            return False
+
+    def stop(self):
+        with self.lock:
+            threads = self.threads
+            self.threads = []
+        for _ in threads:
+            self.queue.put(self._STOP)
+        for thread in threads:
+            thread.join()
+        if self.pool is not None:
+            self.pool.clear()
+            self.pool = None
+
+    def _run(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            while True:
+                item = self.queue.get()
+                try:
+                    if item is self._STOP:
+                        return
+                    status_id, url = item
+                    try:
+                        self._fetch(conn, status_id, url)
+                    except Exception as e:
+                        logging.warning(f"Media download failed for {url}: {str(e)}")
+                        self.metrics.incr('media_failed')
+                    with self.lock:
+                        self.queued.discard(item)
+                finally:
+                    self.queue.task_done()
+        finally:
+            conn.close()
+
+    def _fetch(self, conn, status_id, url):
+        stored = self._claim(url)
+        if stored is not None:
+            self.metrics.incr('media_skipped')
+        else:
+            try:
+                stored = conn.execute(
+                    "SELECT sha256, path, size, content_type FROM media WHERE url = ? AND sha256 IS NOT NULL LIMIT 1",
+                    (url,)
+                ).fetchone()
+                if stored is not None and os.path.exists(stored[1]):
+                    self.metrics.incr('media_skipped')
+                else:
+                    with self.metrics.timer('media_download'):
+                        stored = self._download(url)
+                with self.lock:
+                    self.known[url] = stored
+                    while len(self.known) > self.cache_size:
+                        self.known.popitem(last=False)
+            finally:
+                with self.lock:
+                    self.in_flight.pop(url).set()
+        sha256, path, size, content_type = stored
+        self.writer.write(
+            "INSERT INTO media (status_id, url, kind, sha256, path, size, content_type) VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(status_id, url) DO UPDATE SET sha256 = excluded.sha256, path = excluded.path, "
+            "size = excluded.size, content_type = excluded.content_type, downloaded_at = CURRENT_TIMESTAMP",
+            (status_id, url, media_kind(url), sha256, path, size, content_type)
+        )
+
+    def _claim(self, url):
+        # Returns what is already stored for url, or None once this worker owns fetching it
+        while True:
+            with self.lock:
+                stored = self.known.get(url)
+                if stored is not None and os.path.exists(stored[1]):
+                    self.known.move_to_end(url)
+                    return stored
+                done = self.in_flight.get(url)
+                if done is None:
+                    self.in_flight[url] = threading.Event()
+                    return None
+            # Another worker is fetching the same URL; if it fails, this one tries next
+            done.wait()
+
+    def _download(self, url):
+        response = self.pool.request('GET', url, preload_content=False, retries=self.retry, timeout=self.timeout)
+        try:
+            if response.status != 200:
+                raise RuntimeError(f"HTTP {response.status}")
+            # Stream to a temporary file while hashing, then move it to its content address
+            digest = hashlib.sha256()
+            size = 0
+            temp_path = os.path.join(self.media_dir, f".part-{threading.get_ident()}")
+            try:
+                with open(temp_path, 'wb') as f:
+                    for chunk in response.stream(65536):
+                        digest.update(chunk)
+                        f.write(chunk)
+                        size += len(chunk)
+            except Exception:
+                os.remove(temp_path)
+                raise
+        finally:
+            response.release_conn()
+
+        sha256 = digest.hexdigest()
+        content_type = response.headers.get('Content-Type')
+        directory = os.path.join(self.media_dir, sha256[:2])
+        path = os.path.join(directory, sha256 + media_extension(url, content_type))
+        if os.path.exists(path):
+            # Same bytes under another URL
+            os.remove(temp_path)
+            self.metrics.incr('media_skipped')
+        else:
+            os.makedirs(directory, exist_ok=True)
+            os.replace(temp_path, path)
+            self.metrics.incr('media_downloaded')
+            self.metrics.incr('media_bytes', size)
+        return sha256, path, size, content_type
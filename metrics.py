@@ -0,0 +1,212 @@
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+METRIC_PREFIX = 'twitter_scraper'
+
+class _Timer:
+    __slots__ = ('metrics', 'name', 'start')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_TIMER = _NullTimer()
+
+class NullMetrics:
+    # Stand-in used when metrics are disabled, every call is a no-op
+    enabled = False
+
+    def timer(self, name):
+        return NULL_TIMER
+
+    def observe(self, name, seconds):
+        pass
+
+    def incr(self, name, amount=1):
+        pass
+
+    def begin_run(self):
+        pass
+
+    def snapshot(self, scope='run'):
+        return {}
+
+    def report(self, **fields):
+        return {}
+
+    def close(self):
+        pass
+
+NULL_METRICS = NullMetrics()
+
+class Metrics:
+    enabled = True
+
+    def __init__(self, sinks=None):
+        self.sinks = list(sinks or [])
+        self.lock = threading.Lock()
+        # 'run' is reset by begin_run(), 'total' covers the whole process
+        self.timers = {'run': {}, 'total': {}}
+        self.counters = {'run': {}, 'total': {}}
+        self.run_started = time.time()
+
+    def timer(self, name):
+        return _Timer(self, name)
+
+    def observe(self, name, seconds):
+        with self.lock:
+            for timers in self.timers.values():
+                stats = timers.get(name)
+                if stats is None:
+                    stats = timers[name] = [0, 0.0, seconds]
+                stats[0] += 1
+                stats[1] += seconds
+                stats[2] = max(stats[2], seconds)
+
+    def incr(self, name, amount=1):
+        with self.lock:
+            for counters in self.counters.values():
+                counters[name] = counters.get(name, 0) + amount
+
+    def begin_run(self):
+        with self.lock:
+            self.timers['run'] = {}
+            self.counters['run'] = {}
+            self.run_started = time.time()
+
+    def snapshot(self, scope='run'):
+        with self.lock:
+            timers = {
+                name: {'count': count, 'total_seconds': total, 'mean_seconds': total / count, 'max_seconds': peak}
+                for name, (count, total, peak) in self.timers[scope].items()
+            }
+            counters = dict(self.counters[scope])
+        return {'timers': timers, 'counters': counters}
+
+    def report(self, **fields):
+        # Hands the current run to every sink; a broken sink never fails the run
+        summary = {
+            'started_at': datetime.fromtimestamp(self.run_started, timezone.utc).isoformat(),
+            'finished_at': datetime.now(timezone.utc).isoformat()
+        }
+        summary.update(fields)
+        summary.update(self.snapshot('run'))
+        for sink in self.sinks:
+            try:
+                sink.write(self, summary)
+            except Exception as e:
+                logging.warning(f"Metrics sink {type(sink).__name__} failed: {str(e)}")
+        return summary
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+def render_prometheus(snapshot):
+    lines = [
+        f"# HELP {METRIC_PREFIX}_phase_seconds Time spent in each scrape phase.",
+        f"# TYPE {METRIC_PREFIX}_phase_seconds summary"
+    ]
+    for name, stats in sorted(snapshot['timers'].items()):
+        lines.append(f'{METRIC_PREFIX}_phase_seconds_sum{{phase="{name}"}} {stats["total_seconds"]:.6f}')
+        lines.append(f'{METRIC_PREFIX}_phase_seconds_count{{phase="{name}"}} {stats["count"]}')
+    lines.append(f"# HELP {METRIC_PREFIX}_phase_max_seconds Slowest single call of each scrape phase.")
+    lines.append(f"# TYPE {METRIC_PREFIX}_phase_max_seconds gauge")
+    for name, stats in sorted(snapshot['timers'].items()):
+        lines.append(f'{METRIC_PREFIX}_phase_max_seconds{{phase="{name}"}} {stats["max_seconds"]:.6f}')
+    for name, value in sorted(snapshot['counters'].items()):
+        lines.append(f"# TYPE {METRIC_PREFIX}_{name}_total counter")
+        lines.append(f"{METRIC_PREFIX}_{name}_total {value}")
+    return "\n".join(lines) + "\n"
+
+class JsonSummarySink:
+    # Appends one JSON object per run
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, metrics, summary):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(summary) + "\n")
+
+    def close(self):
+        pass
+
+class PrometheusFileSink:
+    # Text exposition file for node_exporter's textfile collector, replaced atomically after each run
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, metrics, summary):
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(render_prometheus(metrics.snapshot('total')))
+        os.replace(temp_path, self.path)
+
+    def close(self):
+        pass
+
+class PrometheusEndpoint:
+    # Serves live totals on http://host:port/metrics while the scraper is running
+    def __init__(self, metrics, port, host='127.0.0.1'):
+        from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = render_prometheus(metrics.snapshot('total')).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics", daemon=True)
+        self.thread.start()
+        logging.info(f"Serving metrics on http://{host}:{self.server.server_address[1]}/metrics")
+
+    def write(self, metrics, summary):
+        pass
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+def create_metrics(config):
+    if not config['metrics_enabled']:
+        return NULL_METRICS
+    metrics = Metrics()
+    if config['metrics_json_path']:
+        metrics.sinks.append(JsonSummarySink(config['metrics_json_path']))
+    if config['metrics_prometheus_path']:
+        metrics.sinks.append(PrometheusFileSink(config['metrics_prometheus_path']))
+    if config['metrics_port']:
+        try:
+            metrics.sinks.append(PrometheusEndpoint(metrics, config['metrics_port']))
+        except OSError as e:
+            logging.warning(f"Could not serve metrics on port {config['metrics_port']}: {str(e)}")
+    return metrics
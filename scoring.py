@@ -0,0 +1,4 @@
+def score_sentiments(texts):
+    # Runs inside spawned worker processes, which import only this module rather than scraper and selenium
+    from textblob import TextBlob
+    return [TextBlob(text).sentiment.polarity for text in texts]
@@ -1,7 +1,5 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
-from ttkthemes import ThemedTk
 import threading
+import queue
 import time
 import random
 import logging
@@ -11,13 +9,28 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from textblob import TextBlob
+from selenium.common.exceptions import SessionNotCreatedException
 import json
 import os
-from datetime import datetime
+import base64
+import hashlib
+import re
+import math
+import multiprocessing
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, date, timezone, timedelta
+from urllib.parse import quote
 import sqlite3
 
+from metrics import create_metrics, NULL_METRICS
+from media import MediaDownloader, media_kind
+from scoring import score_sentiments
+import settings
+from settings import DB_PATH, BLOCKED_URL_PATTERNS, DEFAULT_CONFIG
+from timeline import TIMELINE_URL_PATTERN, parse_timeline_payload
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -28,15 +41,542 @@ logging.basicConfig(
     ]
 )
 
+# Collects every timeline article not yet marked as scraped, marking it in the same pass
+EXTRACT_TWEETS_JS = '''
+var articles = document.querySelectorAll('article[data-testid="tweet"]:not([data-scraped])');
+var records = [];
+for (var i = 0; i < articles.length; i++) {
+    var article = articles[i];
+    var time = article.querySelector('time');
+    var link = time ? time.closest('a[href*="/status/"]') : article.querySelector('a[href*="/status/"]');
+    var match = link ? link.getAttribute('href').match(/\\/([^\\/]+)\\/status\\/(\\d+)/) : null;
+    if (!match) {
+        continue;  // Still rendering, pick it up on the next pass
+    }
+    article.setAttribute('data-scraped', '1');
+    var text = article.querySelector('div[lang]');
+    var context = article.querySelector('[data-testid="socialContext"]');
+    var media = [];
+    article.querySelectorAll('img[src*="/media/"], video').forEach(function (el) {
+        var src = el.getAttribute('src') || el.getAttribute('poster');
+        if (src && media.indexOf(src) < 0) {
+            media.push(src);
+        }
+    });
+    records.push({
+        status_id: match[2],
+        author: match[1],
+        text: text ? text.innerText : '',
+        created_at: time ? time.getAttribute('datetime') : null,
+        media: media,
+        social_context: context ? context.innerText : null
+    });
+}
+return records;
+'''
+
+# Removes already scraped articles that have scrolled out of view, keeping the newest arguments[0]
+PRUNE_TWEETS_JS = '''
+var keep = arguments[0];
+var selector = arguments[1] ? 'article[data-testid="tweet"][data-scraped]' : 'article[data-testid="tweet"]';
+var articles = document.querySelectorAll(selector);
+var removed = 0;
+for (var i = 0; i < articles.length - keep; i++) {
+    var article = articles[i];
+    if (article.getBoundingClientRect().bottom > 0) {
+        continue;  // Still on screen
+    }
+    (article.closest('[data-testid="cellInnerDiv"]') || article).remove();
+    removed++;
+}
+return removed;
+'''
+
+# Scrolls to the bottom and resolves as soon as a new article is attached, or false on timeout
+SCROLL_AND_WAIT_JS = '''
+var timeout = arguments[0] * 1000;
+var done = arguments[arguments.length - 1];
+var finished = false;
+var observer = new MutationObserver(function (mutations) {
+    for (var i = 0; i < mutations.length; i++) {
+        var added = mutations[i].addedNodes;
+        for (var j = 0; j < added.length; j++) {
+            var node = added[j];
+            if (node.nodeType === 1 && (node.matches('article[data-testid="tweet"]') ||
+                    node.querySelector('article[data-testid="tweet"]'))) {
+                finish(true);
+                return;
+            }
+        }
+    }
+});
+var timer = setTimeout(function () { finish(false); }, timeout);
+function finish(result) {
+    if (!finished) {
+        finished = true;
+        observer.disconnect();
+        clearTimeout(timer);
+        done(result);
+    }
+}
+observer.observe(document.body, {childList: true, subtree: true});
+window.scrollTo(0, document.body.scrollHeight);
+'''
+
+class DatabaseWriter:
+    # Sentinels understood by the writer thread
+    _FLUSH = object()
+    _STOP = object()
+
+    def __init__(self, db_path, batch_size=100, flush_interval=1.0, max_queue=10000, metrics=None,
+                 busy_timeout=30, lock_retries=5):
+        self.db_path = db_path
+        self.metrics = metrics or NULL_METRICS
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.busy_timeout = busy_timeout
+        self.lock_retries = lock_retries
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.thread = None
+        self.rows_written = 0
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self.thread.start()
+
+    def write(self, sql, params):
+        # Blocks when the queue is full so a stalled disk applies backpressure
+        self.queue.put((sql, params))
+
+    def flush(self):
+        if self.thread is None:
+            return
+        self.queue.put(self._FLUSH)
+        # Like queue.join(), but gives up if the writer thread has died
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                if not self.thread.is_alive():
+                    logging.error(f"Database writer is not running, {self.queue.unfinished_tasks} rows not written")
+                    return
+                self.queue.all_tasks_done.wait(0.5)
+
+    def stop(self):
+        if self.thread is None:
+            return
+        self.queue.put(self._STOP)
+        self.thread.join()
+        self.thread = None
+
+    def _run(self):
+        # busy_timeout makes SQLite wait out short locks held by exports or other connections
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.OperationalError as e:
+            logging.warning(f"Could not switch the database to WAL: {str(e)}")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        batch = []
+        deadline = None
+        stopping = False
+        while not stopping:
+            timeout = None if not batch else max(0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            force = item is None
+            if item is self._STOP:
+                stopping = force = True
+            elif item is self._FLUSH:
+                force = True
+            elif item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+
+            if batch and (force or len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._commit(conn, batch)
+                for _ in batch:
+                    self.queue.task_done()
+                batch = []
+            if item is self._FLUSH or item is self._STOP:
+                self.queue.task_done()
+        conn.close()
+
+    def _commit(self, conn, batch):
+        delay = 0.5
+        for attempt in range(self.lock_retries + 1):
+            try:
+                with self.metrics.timer('db_write'):
+                    self._execute_batch(conn, batch)
+                self.rows_written += len(batch)
+                self.metrics.incr('db_rows_written', len(batch))
+                return
+            except sqlite3.OperationalError as e:
+                conn.rollback()
+                if not is_busy_error(e):
+                    break
+                if attempt == self.lock_retries:
+                    logging.error(f"Database still locked after {attempt + 1} attempts, dropped {len(batch)} rows: {str(e)}")
+                    return
+                logging.warning(f"Database locked, retrying {len(batch)} rows in {delay:.1f}s: {str(e)}")
+                time.sleep(delay)
+                delay = min(delay * 2, 10)
+            except sqlite3.Error:
+                conn.rollback()
+                break
+        # Something in the batch is bad; write rows one at a time so only the failing ones are dropped
+        for sql, params in batch:
+            try:
+                conn.execute(sql, params)
+                conn.commit()
+                self.rows_written += 1
+                self.metrics.incr('db_rows_written')
+            except sqlite3.Error as e:
+                conn.rollback()
+                logging.error(f"Database write failed, dropped 1 row: {str(e)}")
+
+    def _execute_batch(self, conn, batch):
+        # Group consecutive rows sharing a statement so each group is one executemany
+        start = 0
+        while start < len(batch):
+            sql = batch[start][0]
+            end = start
+            while end < len(batch) and batch[end][0] == sql:
+                end += 1
+            conn.executemany(sql, [params for _, params in batch[start:end]])
+            start = end
+        conn.commit()
+
+def is_busy_error(error):
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+driver_path_lock = threading.Lock()
+
+def resolve_driver_path(cache_path, refresh=False):
+    # ChromeDriverManager checks versions over the network, so its answer is kept in cache_path between runs.
+    # A cached path of None means neither method found a driver and selenium resolves one itself.
+    with driver_path_lock:
+        if not refresh and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r') as f:
+                    driver_path = json.load(f)['path']
+                if driver_path is None or os.path.exists(driver_path):
+                    return driver_path
+            except (OSError, ValueError, KeyError) as e:
+                logging.warning(f"Ignoring driver cache {cache_path}: {str(e)}")
+
+        driver_path = None
+        try:
+            # Method 1: Using ChromeDriverManager
+            from webdriver_manager.chrome import ChromeDriverManager
+            driver_path = ChromeDriverManager().install()
+        except Exception as e:
+            logging.warning(f"ChromeDriverManager failed: {str(e)}")
+            # Method 2: Using local chromedriver.exe
+            local_path = os.path.join(os.getcwd(), "chromedriver.exe")
+            if os.path.exists(local_path):
+                driver_path = local_path
+        try:
+            with open(cache_path, 'w') as f:
+                json.dump({'path': driver_path, 'resolved_at': datetime.now(timezone.utc).isoformat()}, f)
+        except OSError as e:
+            logging.warning(f"Could not write driver cache {cache_path}: {str(e)}")
+        return driver_path
+
+def is_driver_mismatch(error):
+    # Resolving again only helps when the driver binary is gone or no longer matches Chrome,
+    # not for proxy errors or a crashing browser
+    if isinstance(error, OSError) or type(error).__name__ == 'NoSuchDriverException':
+        return True
+    return isinstance(error, SessionNotCreatedException) and 'version' in str(error).lower()
+
+def status_id_date(status_id):
+    # Status IDs are snowflakes: the high bits hold milliseconds since the Twitter epoch
+    milliseconds = (int(status_id) >> 22) + 1288834974657
+    return datetime.fromtimestamp(milliseconds / 1000, tz=timezone.utc).date()
+
+def search_windows(since=None, until=None, days=28, window_days=7):
+    # Splits [since, until) into since:/until: date windows, newest first; until is exclusive like the search operator
+    until = date.fromisoformat(until) if isinstance(until, str) else until
+    since = date.fromisoformat(since) if isinstance(since, str) else since
+    until = until or datetime.now(timezone.utc).date() + timedelta(days=1)
+    since = since or until - timedelta(days=days)
+    windows = []
+    end = until
+    while end > since:
+        start = max(since, end - timedelta(days=window_days))
+        windows.append((start, end))
+        end = start
+    return windows
+
+STATS_ACCUMULATE = (
+    "tweet_count = tweet_count + excluded.tweet_count, "
+    "scored_count = scored_count + excluded.scored_count, "
+    "sentiment_sum = sentiment_sum + excluded.sentiment_sum, "
+    "sentiment_sumsq = sentiment_sumsq + excluded.sentiment_sumsq"
+)
+
+# Hour and day buckets use the tweet's own time when known, otherwise the scrape time
+STATS_GRANULARITIES = {'hour': '%Y-%m-%d %H:00:00', 'day': '%Y-%m-%d'}
+
+# Sentiment histogram: 10 equal buckets over [-1, 1]
+HISTOGRAM_BUCKETS = 10
+
+def _histogram_bucket(sentiment):
+    return f"MAX(0, MIN({HISTOGRAM_BUCKETS - 1}, CAST(({sentiment} + 1) * {HISTOGRAM_BUCKETS / 2} AS INTEGER)))"
+
+def _stats_statements(row, sign):
+    # Applies one scraped_data row (NEW or OLD) to every aggregate table, adding or subtracting it
+    username = f"COALESCE({row}.username, '')"
+    sentiment = f"{row}.sentiment"
+    moment = f"COALESCE(datetime({row}.created_at), {row}.timestamp)"
+    deltas = (f"{sign}, {sign} * ({sentiment} IS NOT NULL), {sign} * COALESCE({sentiment}, 0), "
+              f"{sign} * COALESCE({sentiment} * {sentiment}, 0)")
+    statements = [
+        f"INSERT INTO stats_user (username, tweet_count, scored_count, sentiment_sum, sentiment_sumsq) "
+        f"VALUES ({username}, {deltas}) ON CONFLICT(username) DO UPDATE SET {STATS_ACCUMULATE};"
+    ]
+    for granularity, fmt in STATS_GRANULARITIES.items():
+        statements.append(
+            f"INSERT INTO stats_timeseries (username, granularity, bucket, tweet_count, scored_count, "
+            f"sentiment_sum, sentiment_sumsq) VALUES ({username}, '{granularity}', strftime('{fmt}', {moment}), "
+            f"{deltas}) ON CONFLICT(username, granularity, bucket) DO UPDATE SET {STATS_ACCUMULATE};"
+        )
+    statements.append(
+        f"INSERT INTO stats_histogram (username, bucket, count) SELECT {username}, {_histogram_bucket(sentiment)}, "
+        f"{sign} WHERE {sentiment} IS NOT NULL "
+        f"ON CONFLICT(username, bucket) DO UPDATE SET count = count + excluded.count;"
+    )
+    return "\n".join(statements)
+
+def _summarize(count, scored, total, total_squares):
+    mean = total / scored if scored else None
+    stddev = math.sqrt(max(0.0, total_squares / scored - mean * mean)) if scored else None
+    return {'tweets': count, 'scored': scored, 'mean_sentiment': mean, 'stddev_sentiment': stddev}
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until_token(self):
+        if self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) / self.rate
+
+class RateLimiter:
+    # One token bucket per (scope, key), e.g. ('account', 'alice') or ('proxy', '1.2.3.4:8080')
+    def __init__(self, limits):
+        self.limits = limits
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def _bucket(self, scope, key):
+        bucket = self.buckets.get((scope, key))
+        if bucket is None:
+            limit = self.limits[scope]
+            bucket = self.buckets[(scope, key)] = TokenBucket(limit['rate'], limit['burst'])
+        return bucket
+
+    def acquire(self, **keys):
+        # Blocks until every named bucket has a token, then takes one from each
+        while True:
+            with self.lock:
+                buckets = [self._bucket(scope, key) for scope, key in keys.items() if scope in self.limits]
+                now = time.monotonic()
+                wait = 0
+                for bucket in buckets:
+                    bucket.refill(now)
+                    wait = max(wait, bucket.time_until_token())
+                if wait == 0:
+                    for bucket in buckets:
+                        bucket.tokens -= 1
+                    return
+            time.sleep(wait)
+
+def text_hash(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+def tweet_key(tweet):
+    # Seen-set key as a plain int: the status ID, or 64 bits of the content hash when there is none
+    if tweet['status_id']:
+        return int(tweet['status_id'])
+    return int(content_hash(tweet['text'])[:16], 16)
+
+def content_hash(text):
+    # Case and whitespace differences do not make a tweet distinct
+    return text_hash(' '.join((text or '').split()).lower())
+
+class SentimentAnalyzer:
+    def __init__(self, db_path, writer, workers=2, batch_size=200, cache_size=10000, poll_interval=2.0,
+                 metrics=None):
+        self.db_path = db_path
+        self.metrics = metrics or NULL_METRICS
+        self.writer = writer
+        self.workers = workers
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.poll_interval = poll_interval
+        self.cache = OrderedDict()
+        self.executor = None
+        self.thread = None
+        self.lock = threading.Lock()
+        self.wake_event = threading.Event()
+        self.stop_event = threading.Event()
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="sentiment", daemon=True)
+        self.thread.start()
+
+    def notify(self):
+        self.wake_event.set()
+
+    def stop(self):
+        if self.thread is not None:
+            self.stop_event.set()
+            self.wake_event.set()
+            self.thread.join()
+            self.thread = None
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            try:
+                self.backfill()
+            except Exception as e:
+                logging.error(f"Sentiment scoring failed: {str(e)}")
+            self.wake_event.wait(self.poll_interval)
+            self.wake_event.clear()
+
+    def backfill(self):
+        # Scores every row whose sentiment is still NULL, oldest first
+        with self.lock:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                total = 0
+                last_id = 0
+                while not self.stop_event.is_set():
+                    rows = conn.execute(
+                        "SELECT id, tweet_text FROM scraped_data WHERE sentiment IS NULL AND id > ? ORDER BY id LIMIT ?",
+                        (last_id, self.batch_size)
+                    ).fetchall()
+                    if not rows:
+                        break
+                    last_id = rows[-1][0]
+                    with self.metrics.timer('sentiment'):
+                        scores = self.score([text or '' for _, text in rows], conn)
+                    self.metrics.incr('sentiment_scored', len(rows))
+                    for (row_id, _), score in zip(rows, scores):
+                        self.writer.write("UPDATE scraped_data SET sentiment = ? WHERE id = ?", (score, row_id))
+                    total += len(rows)
+            finally:
+                conn.close()
+            if total:
+                self.writer.flush()
+                logging.info(f"Scored sentiment for {total} tweets")
+            return total
+
+    def score(self, texts, conn):
+        hashes = [text_hash(text) for text in texts]
+        scores = {}
+        for digest in hashes:
+            if digest in self.cache:
+                self.cache.move_to_end(digest)
+                scores[digest] = self.cache[digest]
+
+        missing = list({digest for digest in hashes if digest not in scores})
+        for start in range(0, len(missing), 500):
+            chunk = missing[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            scores.update(conn.execute(
+                f"SELECT text_hash, polarity FROM sentiment_cache WHERE text_hash IN ({placeholders})", chunk
+            ).fetchall())
+
+        pending = {}
+        for digest, text in zip(hashes, texts):
+            if digest not in scores:
+                pending[digest] = text
+        if pending:
+            for digest, polarity in zip(pending, self._score_texts(list(pending.values()))):
+                scores[digest] = polarity
+                self.writer.write(
+                    "INSERT OR IGNORE INTO sentiment_cache (text_hash, polarity) VALUES (?, ?)", (digest, polarity)
+                )
+
+        for digest in hashes:
+            self.cache[digest] = scores[digest]
+            self.cache.move_to_end(digest)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return [scores[digest] for digest in hashes]
+
+    def _score_texts(self, texts):
+        if self.workers > 0:
+            try:
+                return self._score_in_pool(texts)
+            except (BrokenProcessPool, RuntimeError, OSError) as e:
+                # Spawned workers re-run the launching script, which breaks when it has no __main__ guard
+                logging.warning(f"Sentiment worker processes failed, scoring in-thread from now on: {str(e)}")
+                if self.executor is not None:
+                    self.executor.shutdown(wait=False, cancel_futures=True)
+                    self.executor = None
+                self.workers = 0
+        return score_sentiments(texts)
+
+    def _score_in_pool(self, texts):
+        if self.executor is None:
+            # This runs on the sentiment thread, and forking a multithreaded process can copy held locks
+            self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                mp_context=multiprocessing.get_context('spawn'))
+        size = max(1, -(-len(texts) // self.workers))
+        chunks = [texts[start:start + size] for start in range(0, len(texts), size)]
+        return [score for chunk in self.executor.map(score_sentiments, chunks) for score in chunk]
+
 class TwitterScraper:
-    def __init__(self):
+    def __init__(self, config=None, writer=None, sentiment=None, metrics=None, media=None):
         self.driver = None
         self.is_running = False
-        self.config = self.load_config()
-        self.setup_database()
+        self.proxy = None
+        self.active_proxy = None
+        self.account = None
+        self.logged_in_as = None
+        self.pending_responses = set()
+        self.last_error = None
+        self.spare_driver = None
+        self.spare_thread = None
+        self.spare_lock = threading.Lock()
+        self.config = config if config is not None else self.load_config()
+        self.rate_limiter = RateLimiter(self.config['rate_limits'])
+        self.metrics = metrics if metrics is not None else create_metrics(self.config)
+        self.setup_database(writer, sentiment, media)
 
-    def setup_database(self):
-        self.conn = sqlite3.connect('scraper.db')
+    def create_session(self, proxy=None):
+        # Extra browser session sharing this scraper's config, writer, sentiment and media stages
+        session = TwitterScraper(self.config, self.writer, self.sentiment, self.metrics, self.media)
+        session.proxy = proxy
+        session.rate_limiter = self.rate_limiter
+        return session
+
+    def setup_database(self, writer=None, sentiment=None, media=None):
+        # WAL lets the GUI read while the writer thread commits
+        self.conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
         self.cursor = self.conn.cursor()
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS scraped_data (
@@ -47,76 +587,394 @@ class TwitterScraper:
                 timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         ''')
+        self._ensure_columns('scraped_data', {
+            'status_id': 'TEXT',
+            'author': 'TEXT',
+            'created_at': 'TEXT',
+            'media_urls': 'TEXT',
+            'reply_count': 'INTEGER',
+            'retweet_count': 'INTEGER',
+            'like_count': 'INTEGER',
+            'quote_count': 'INTEGER',
+            'view_count': 'INTEGER',
+            'content_hash': 'TEXT',
+            'query': 'TEXT'
+        })
+        self.setup_dedup()
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS scrape_state (
+                target TEXT PRIMARY KEY,
+                newest_id INTEGER,
+                oldest_id INTEGER,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sentiment_cache (
+                text_hash TEXT PRIMARY KEY,
+                polarity REAL
+            )
+        ''')
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS media (
+                status_id TEXT,
+                url TEXT,
+                kind TEXT,
+                sha256 TEXT,
+                path TEXT,
+                size INTEGER,
+                content_type TEXT,
+                downloaded_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (status_id, url)
+            )
+        ''')
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_media_url ON media (url)")
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_scraped_data_username_timestamp ON scraped_data (username, timestamp)"
+        )
+        self.setup_stats()
+        self.setup_search()
         self.conn.commit()
 
-    def load_config(self):
-        if os.path.exists('scraper_config.json'):
-            with open('scraper_config.json', 'r') as f:
-                return json.load(f)
-        return {
-            'delay_min': 2,
-            'delay_max': 5,
-            'max_retries': 3,
-            'proxy_enabled': False,
-            'proxies': [],
-            'max_tweets': 100,
-            'save_images': False,
-            'save_videos': False
-        }
+        # Sessions created by create_session reuse their parent's pipeline
+        self.owns_pipeline = writer is None
+        if not self.owns_pipeline:
+            self.writer = writer
+            self.sentiment = sentiment
+            self.media = media
+            return
+
+        self.writer = DatabaseWriter(
+            DB_PATH,
+            batch_size=self.config['db_batch_size'],
+            flush_interval=self.config['db_flush_interval'],
+            max_queue=self.config['db_queue_size'],
+            metrics=self.metrics
+        )
+        self.writer.start()
+
+        self.sentiment = SentimentAnalyzer(
+            DB_PATH,
+            self.writer,
+            workers=self.config['sentiment_workers'],
+            batch_size=self.config['sentiment_batch_size'],
+            cache_size=self.config['sentiment_cache_size'],
+            metrics=self.metrics
+        )
+        if self.config['sentiment_enabled']:
+            self.sentiment.start()
+
+        # Download threads start on the first queued URL
+        self.media = MediaDownloader(
+            DB_PATH,
+            self.writer,
+            media_dir=self.config['media_dir'],
+            workers=self.config['media_workers'],
+            per_host=self.config['media_per_host'],
+            retries=self.config['media_retries'],
+            max_queue=self.config['media_queue_size'],
+            cache_size=self.config['media_cache_size'],
+            metrics=self.metrics
+        )
+
+    def setup_dedup(self):
+        if self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_scraped_data_status_id'"
+        ).fetchone():
+            return
+        # One-time migration: hash existing rows and drop duplicates before adding the unique indexes
+        rows = self.cursor.execute("SELECT id, tweet_text FROM scraped_data WHERE content_hash IS NULL").fetchall()
+        self.cursor.executemany(
+            "UPDATE scraped_data SET content_hash = ? WHERE id = ?",
+            [(content_hash(text), row_id) for row_id, text in rows]
+        )
+        self.cursor.execute('''
+            DELETE FROM scraped_data WHERE status_id IS NOT NULL AND id NOT IN (
+                SELECT MIN(id) FROM scraped_data WHERE status_id IS NOT NULL GROUP BY status_id
+            )
+        ''')
+        self.cursor.execute('''
+            DELETE FROM scraped_data WHERE status_id IS NULL AND id NOT IN (
+                SELECT MIN(id) FROM scraped_data WHERE status_id IS NULL GROUP BY username, content_hash
+            )
+        ''')
+        self.cursor.execute(
+            "CREATE UNIQUE INDEX idx_scraped_data_content ON scraped_data (username, content_hash) "
+            "WHERE status_id IS NULL"
+        )
+        self.cursor.execute(
+            "CREATE UNIQUE INDEX idx_scraped_data_status_id ON scraped_data (status_id) WHERE status_id IS NOT NULL"
+        )
+        if rows:
+            logging.info(f"Hashed {len(rows)} existing tweets and removed duplicates")
+
+    def setup_search(self):
+        # External-content FTS5 index kept in sync with scraped_data by triggers
+        try:
+            is_new = self.cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'tweets_fts'"
+            ).fetchone() is None
+            self.cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS tweets_fts USING fts5(
+                    tweet_text, content='scraped_data', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            logging.warning(f"Full-text search unavailable, falling back to LIKE: {str(e)}")
+            self.fts_enabled = False
+            return
+        self.fts_enabled = True
+        self.cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS scraped_data_fts_insert AFTER INSERT ON scraped_data BEGIN
+                INSERT INTO tweets_fts (rowid, tweet_text) VALUES (NEW.id, NEW.tweet_text);
+            END
+        ''')
+        self.cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS scraped_data_fts_delete AFTER DELETE ON scraped_data BEGIN
+                INSERT INTO tweets_fts (tweets_fts, rowid, tweet_text) VALUES ('delete', OLD.id, OLD.tweet_text);
+            END
+        ''')
+        self.cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS scraped_data_fts_update AFTER UPDATE OF tweet_text ON scraped_data BEGIN
+                INSERT INTO tweets_fts (tweets_fts, rowid, tweet_text) VALUES ('delete', OLD.id, OLD.tweet_text);
+                INSERT INTO tweets_fts (rowid, tweet_text) VALUES (NEW.id, NEW.tweet_text);
+            END
+        ''')
+        if is_new:
+            self.cursor.execute("INSERT INTO tweets_fts (tweets_fts) VALUES ('rebuild')")
+
+    def setup_stats(self):
+        # Aggregates are maintained by triggers, so every writer keeps them current without extra queries
+        is_new = self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'stats_user'"
+        ).fetchone() is None
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stats_user (
+                username TEXT PRIMARY KEY,
+                tweet_count INTEGER NOT NULL DEFAULT 0,
+                scored_count INTEGER NOT NULL DEFAULT 0,
+                sentiment_sum REAL NOT NULL DEFAULT 0,
+                sentiment_sumsq REAL NOT NULL DEFAULT 0
+            )
+        ''')
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stats_timeseries (
+                username TEXT NOT NULL,
+                granularity TEXT NOT NULL,
+                bucket TEXT NOT NULL,
+                tweet_count INTEGER NOT NULL DEFAULT 0,
+                scored_count INTEGER NOT NULL DEFAULT 0,
+                sentiment_sum REAL NOT NULL DEFAULT 0,
+                sentiment_sumsq REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (username, granularity, bucket)
+            )
+        ''')
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stats_histogram (
+                username TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (username, bucket)
+            )
+        ''')
+        self.cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS scraped_data_stats_insert AFTER INSERT ON scraped_data BEGIN
+                {_stats_statements('NEW', 1)}
+            END
+        ''')
+        self.cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS scraped_data_stats_delete AFTER DELETE ON scraped_data BEGIN
+                {_stats_statements('OLD', -1)}
+            END
+        ''')
+        # Re-scrapes rewrite these columns with the same values, so only real changes touch the aggregates.
+        # Recreated every time so databases with the older trigger pick up the WHEN clause.
+        self.cursor.execute("DROP TRIGGER IF EXISTS scraped_data_stats_update")
+        self.cursor.execute(f'''
+            CREATE TRIGGER scraped_data_stats_update
+            AFTER UPDATE OF username, sentiment, created_at ON scraped_data
+            WHEN OLD.username IS NOT NEW.username OR OLD.sentiment IS NOT NEW.sentiment
+                OR OLD.created_at IS NOT NEW.created_at
+            BEGIN
+                {_stats_statements('OLD', -1)}
+                {_stats_statements('NEW', 1)}
+            END
+        ''')
+        if is_new:
+            self.rebuild_stats()
+
+    def rebuild_stats(self):
+        # One full pass, used when the aggregate tables are first added to an existing database
+        moment = "COALESCE(datetime(created_at), timestamp)"
+        sums = ("COUNT(*), COUNT(sentiment), COALESCE(SUM(sentiment), 0), "
+                "COALESCE(SUM(sentiment * sentiment), 0)")
+        self.cursor.execute("DELETE FROM stats_user")
+        self.cursor.execute("DELETE FROM stats_timeseries")
+        self.cursor.execute("DELETE FROM stats_histogram")
+        self.cursor.execute(
+            f"INSERT INTO stats_user (username, tweet_count, scored_count, sentiment_sum, sentiment_sumsq) "
+            f"SELECT COALESCE(username, ''), {sums} FROM scraped_data GROUP BY 1"
+        )
+        for granularity, fmt in STATS_GRANULARITIES.items():
+            self.cursor.execute(
+                f"INSERT INTO stats_timeseries (username, granularity, bucket, tweet_count, scored_count, "
+                f"sentiment_sum, sentiment_sumsq) SELECT COALESCE(username, ''), '{granularity}', "
+                f"strftime('{fmt}', {moment}), {sums} FROM scraped_data GROUP BY 1, 3"
+            )
+        self.cursor.execute(
+            f"INSERT INTO stats_histogram (username, bucket, count) "
+            f"SELECT COALESCE(username, ''), {_histogram_bucket('sentiment')}, COUNT(*) FROM scraped_data "
+            f"WHERE sentiment IS NOT NULL GROUP BY 1, 2"
+        )
+        self.conn.commit()
+
+    def _ensure_columns(self, table, columns):
+        # CREATE TABLE IF NOT EXISTS leaves older databases untouched, so add new columns here
+        existing = {row[1] for row in self.cursor.execute(f"PRAGMA table_info({table})")}
+        for name, column_type in columns.items():
+            if name not in existing:
+                self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+
+    @staticmethod
+    def load_config():
+        return settings.load_config()
 
     def save_config(self):
-        with open('scraper_config.json', 'w') as f:
-            json.dump(self.config, f, indent=4)
+        settings.save_config(self.config)
 
     def setup_driver(self):
         if self.driver is not None:
             return
             
+        started = time.perf_counter()
         try:
-            options = Options()
-            options.add_argument("--disable-gpu")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--disable-notifications")
-            options.add_argument("--disable-popup-blocking")
-            options.add_experimental_option("excludeSwitches", ["enable-logging"])
-            
-            if self.config['proxy_enabled'] and self.config['proxies']:
-                proxy = random.choice(self.config['proxies'])
-                options.add_argument(f'--proxy-server={proxy}')
-            
-            # Try multiple methods to initialize ChromeDriver
-            try:
-                # Method 1: Using ChromeDriverManager
-                service = Service(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=options)
-                logging.info("ChromeDriver initialized successfully using ChromeDriverManager")
-            except Exception as e:
-                logging.warning(f"ChromeDriverManager failed: {str(e)}")
-                try:
-                    # Method 2: Using local chromedriver.exe
-                    driver_path = os.path.join(os.getcwd(), "chromedriver.exe")
-                    if os.path.exists(driver_path):
-                        service = Service(executable_path=driver_path)
-                        self.driver = webdriver.Chrome(service=service, options=options)
-                        logging.info("ChromeDriver initialized successfully using local driver")
-                    else:
-                        # Method 3: Basic initialization
-                        self.driver = webdriver.Chrome(options=options)
-                        logging.info("ChromeDriver initialized successfully using basic method")
-                except Exception as e:
-                    logging.error(f"All ChromeDriver initialization methods failed: {str(e)}")
-                    raise
+            spare = self._take_spare_driver()
+            if spare is not None:
+                self.driver, self.active_proxy = spare
+                self.metrics.incr('driver_prewarm_hits')
+                logging.info("Using pre-warmed ChromeDriver")
+            else:
+                options, self.active_proxy = self._driver_options()
+                self.driver = self._start_driver(options)
+            self.apply_resource_blocking()
+            self.metrics.observe('setup_driver', time.perf_counter() - started)
         except Exception as e:
             logging.error(f"Error setting up ChromeDriver: {str(e)}")
             raise
+        # Two browsers cannot share one profile directory, so persistent profiles are never pre-warmed
+        if self.config['prewarm_driver'] and not self.config['persist_profile']:
+            self.prewarm_driver()
+
+    def _driver_options(self):
+        options = Options()
+        if self.config['headless']:
+            options.add_argument("--headless=new")
+            options.add_argument("--window-size=1280,2000")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-notifications")
+        options.add_argument("--disable-popup-blocking")
+        # Search fan-out scrolls several tabs at once, so background tabs must not be throttled
+        options.add_argument("--disable-background-timer-throttling")
+        options.add_argument("--disable-backgrounding-occluded-windows")
+        options.add_argument("--disable-renderer-backgrounding")
+        options.add_experimental_option("excludeSwitches", ["enable-logging"])
+
+        if self.config['browser_profile'] == 'light':
+            # Images are still referenced in the DOM, so media URLs are extracted without being fetched
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_argument("--mute-audio")
+            options.add_argument("--disable-extensions")
+            options.add_argument("--disable-background-networking")
+            options.add_experimental_option('prefs', {
+                'profile.managed_default_content_settings.images': 2,
+                'profile.default_content_setting_values.notifications': 2
+            })
+
+        if self.config['capture_mode'] == 'network':
+            # Network events land in the performance log so timeline JSON can be read back over CDP
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+            options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+
+        if self.config['persist_profile'] and self.account:
+            options.add_argument(f"--user-data-dir={self.profile_path(self.account)}")
+        
+        proxy = self.proxy
+        if proxy is None and self.config['proxy_enabled'] and self.config['proxies']:
+            proxy = random.choice(self.config['proxies'])
+        if proxy:
+            options.add_argument(f'--proxy-server={proxy}')
+        return options, proxy
+
+    def _start_driver(self, options):
+        driver_path = resolve_driver_path(self.config['driver_cache_path'])
+        try:
+            return self._launch_driver(driver_path, options)
+        except Exception as e:
+            if not is_driver_mismatch(e):
+                logging.error(f"ChromeDriver initialization failed: {str(e)}")
+                raise
+            # A cached driver stops working when Chrome updates, so look it up again once
+            logging.warning(f"ChromeDriver {driver_path or '(selenium default)'} does not match Chrome, resolving again: {str(e)}")
+            return self._launch_driver(resolve_driver_path(self.config['driver_cache_path'], refresh=True), options)
+
+    def _launch_driver(self, driver_path, options):
+        if driver_path:
+            driver = webdriver.Chrome(service=Service(executable_path=driver_path), options=options)
+            logging.info(f"ChromeDriver initialized successfully using {driver_path}")
+        else:
+            # Basic initialization, selenium finds a driver itself
+            driver = webdriver.Chrome(options=options)
+            logging.info("ChromeDriver initialized successfully using basic method")
+        return driver
+
+    def apply_resource_blocking(self):
+        # Blocking over CDP applies per tab, so new tabs call this again
+        if self.config['browser_profile'] != 'light':
+            return
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.config['blocked_urls']})
+        except Exception as e:
+            logging.warning(f"Could not block resources: {str(e)}")
+
+    def prewarm_driver(self):
+        # Starts a spare browser in the background so the next setup_driver skips the cold start
+        with self.spare_lock:
+            if self.spare_thread is not None:
+                return
+            self.spare_thread = threading.Thread(target=self._build_spare_driver, name="driver-prewarm", daemon=True)
+            self.spare_thread.start()
+
+    def _build_spare_driver(self):
+        try:
+            options, proxy = self._driver_options()
+            driver = self._start_driver(options)
+            with self.spare_lock:
+                self.spare_driver = (driver, proxy)
+        except Exception as e:
+            logging.warning(f"Could not pre-warm ChromeDriver: {str(e)}")
+
+    def _take_spare_driver(self):
+        thread = self.spare_thread
+        if thread is None:
+            return None
+        thread.join()
+        with self.spare_lock:
+            spare = self.spare_driver
+            self.spare_driver = None
+            self.spare_thread = None
+        return spare
 
     def login(self, username, password):
+        started = time.perf_counter()
         try:
             if self.driver is None:
                 self.setup_driver()
                 
-            self.driver.get("https://twitter.com/i/flow/login")
+            self.throttle()
+            self.driver.get(f"{self.config['base_url']}/i/flow/login")
             wait = WebDriverWait(self.driver, 30)
 
             # Handle username
@@ -143,339 +1001,655 @@ class TwitterScraper:
         except Exception as e:
             logging.error(f"Login failed: {str(e)}")
             return False
+        finally:
+            self.metrics.observe('login', time.perf_counter() - started)
+
+    def throttle(self):
+        # Every page load and scroll step spends one token for its proxy and, when logged in, one for its account
+        keys = {'proxy': self.active_proxy or 'direct'}
+        if self.account:
+            keys['account'] = self.account
+        self.rate_limiter.acquire(**keys)
+
+    def session_path(self, account):
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]', '_', account)
+        return os.path.join(self.config['session_dir'], f"{safe_name}.json")
+
+    def profile_path(self, account):
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]', '_', account)
+        return os.path.abspath(os.path.join(self.config['session_dir'], 'profiles', safe_name))
+
+    def save_session(self, account):
+        try:
+            os.makedirs(self.config['session_dir'], exist_ok=True)
+            path = self.session_path(account)
+            # Written aside and moved into place, so a crash never leaves a truncated cookie file
+            with open(path + '.tmp', 'w') as f:
+                json.dump(self.driver.get_cookies(), f)
+            os.replace(path + '.tmp', path)
+        except Exception as e:
+            logging.warning(f"Could not save session for {account}: {str(e)}")
+
+    def restore_session(self, account):
+        if self.config['persist_profile']:
+            # The Chrome profile already carries the cookies
+            if not os.path.isdir(self.profile_path(account)):
+                return False
+            return self.is_logged_in()
+
+        path = self.session_path(account)
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, 'r') as f:
+                cookies = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable session for {account}: {str(e)}")
+            return False
+        # Cookies can only be set for the domain that is currently loaded
+        self.driver.get(self.config['base_url'])
+        for cookie in cookies:
+            try:
+                self.driver.add_cookie(cookie)
+            except Exception as e:
+                logging.debug(f"Skipped cookie {cookie.get('name')}: {str(e)}")
+        return self.is_logged_in()
+
+    def is_logged_in(self, timeout=5):
+        try:
+            self.throttle()
+            self.driver.get(f"{self.config['base_url']}/home")
+            WebDriverWait(self.driver, timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="AppTabBar_Home_Link"]'))
+            )
+            return True
+        except Exception:
+            return False
+
+    def ensure_logged_in(self, username, password):
+        # Reuse a warm driver that is still signed in to the same account
+        if self.driver is not None and self.logged_in_as == username:
+            try:
+                if self.driver.find_elements(By.CSS_SELECTOR, '[data-testid="AppTabBar_Home_Link"]'):
+                    return True
+            except Exception as e:
+                # The browser was closed or its session crashed, so start a fresh one below
+                logging.warning(f"Warm ChromeDriver is no longer usable: {str(e)}")
+                self.quit_driver()
+        if self.driver is not None and self.logged_in_as != username:
+            self.quit_driver()
+
+        self.account = username
+        self.logged_in_as = None
+        self.setup_driver()
+        if self.restore_session(username):
+            logging.info(f"Restored saved session for {username}")
+        elif self.login(username, password):
+            self.save_session(username)
+        else:
+            return False
+        self.logged_in_as = username
+        return True
+
+    def extract_new_tweets(self, username):
+        if self.config['capture_mode'] == 'network':
+            return self.capture_network_tweets()
+        return self.extract_dom_tweets(username)
+
+    def extract_dom_tweets(self, username):
+        if self.config['extraction_mode'] == 'elements':
+            return self._extract_tweets_elements(username)
+        # One round trip returns only articles not already marked as scraped
+        return self.driver.execute_script(EXTRACT_TWEETS_JS) or []
+
+    def reset_network_capture(self):
+        # Drop buffered events from earlier pages
+        self.driver.get_log('performance')
+        self.pending_responses.clear()
 
-    def scrape_tweets(self, username, num_tweets, callback=None):
+    def capture_network_tweets(self):
+        records = []
+        for entry in self.driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            method = message.get('method')
+            params = message.get('params', {})
+            if method == 'Network.responseReceived':
+                if TIMELINE_URL_PATTERN.search(params['response']['url']):
+                    self.pending_responses.add(params['requestId'])
+            elif method == 'Network.loadingFinished' and params.get('requestId') in self.pending_responses:
+                self.pending_responses.discard(params['requestId'])
+                records.extend(self._read_timeline_response(params['requestId']))
+        return records
+
+    def _read_timeline_response(self, request_id):
         try:
-            self.driver.get(f"https://twitter.com/{username}")
-            wait = WebDriverWait(self.driver, 10)
+            response = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+            body = response['body']
+            if response.get('base64Encoded'):
+                body = base64.b64decode(body).decode('utf-8')
+            return parse_timeline_payload(json.loads(body))
+        except Exception as e:
+            logging.warning(f"Could not read timeline response {request_id}: {str(e)}")
+            return []
 
-            tweet_texts = []
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
+    def _extract_tweets_elements(self, username):
+        # Legacy path: one WebDriver call per element, no status IDs
+        elements = self.driver.find_elements(By.XPATH, '//article[@data-testid="tweet"]//div[@lang]')
+        return [
+            {'status_id': None, 'author': username, 'text': element.text, 'created_at': None, 'media': [],
+             'social_context': None}
+            for element in elements
+        ]
 
-            while len(tweet_texts) < num_tweets and self.is_running:
-                tweets = wait.until(EC.presence_of_all_elements_located((By.XPATH, '//article[@data-testid="tweet"]//div[@lang]')))
-                for tweet in tweets:
+    def scrape_tweets(self, username, num_tweets, callback=None, mode='full', progress=None):
+        return list(self.iter_tweets(username, num_tweets, callback, mode, progress))
+
+    def iter_tweets(self, username, num_tweets, callback=None, mode='full', progress=None):
+        # Yields records as they are stored, so long runs never hold the whole timeline in memory.
+        # mode: 'full' scrapes from the top, 'new' stops at tweets seen on an earlier run,
+        # 'backfill' resumes below the oldest tweet already collected
+        count = 0
+        self.last_error = None
+        newest_known, oldest_known = self.get_scrape_state(username)
+        has_state = newest_known is not None
+        run_newest = run_oldest = None
+        # A run from the top only joins the stored range once it reaches a known tweet
+        contiguous = not has_state or mode == 'backfill'
+        try:
+            if self.config['capture_mode'] == 'network':
+                self.reset_network_capture()
+            self.throttle()
+            with self.metrics.timer('page_load'):
+                if mode == 'backfill' and has_state:
+                    # Search results before the checkpoint's day; newer ones are skipped below
+                    until = status_id_date(oldest_known) + timedelta(days=1)
+                    query = quote(f"from:{username} until:{until.isoformat()}")
+                    self.driver.get(f"{self.config['base_url']}/search?q={query}&f=live")
+                else:
+                    self.driver.get(f"{self.config['base_url']}/{username}")
+                wait = WebDriverWait(self.driver, 10)
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'article[data-testid="tweet"]')))
+
+            seen_keys = set()
+            reached_known = False
+            steps = 0
+
+            while count < num_tweets and self.is_running and not reached_known:
+                with self.metrics.timer('extraction'):
+                    batch = self.extract_new_tweets(username)
+                for tweet in batch:
                     if not self.is_running:
                         break
-                    tweet_text = tweet.text
-                    if tweet_text not in tweet_texts:
-                        tweet_texts.append(tweet_text)
-                        sentiment = TextBlob(tweet_text).sentiment.polarity
-                        self.save_to_database(username, tweet_text, sentiment)
-                        if callback:
-                            callback(f"Found tweet: {tweet_text[:50]}...")
-                        if len(tweet_texts) >= num_tweets:
-                            break
+                    key = tweet_key(tweet)
+                    if key in seen_keys:
+                        self.metrics.incr('duplicates_skipped')
+                        continue
+                    seen_keys.add(key)
 
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(random.uniform(2, 4))
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
+                    # Pinned tweets and reposts are out of timeline order, so they never move the marks
+                    status_id = int(tweet['status_id']) if tweet['status_id'] and not tweet['social_context'] else None
+                    if status_id is not None and has_state:
+                        if mode == 'backfill' and status_id >= oldest_known:
+                            continue
+                        if mode != 'backfill' and status_id <= newest_known:
+                            contiguous = True
+                            if mode == 'new':
+                                reached_known = True
+                                break
+                    if status_id is not None:
+                        run_newest = max(run_newest or status_id, status_id)
+                        run_oldest = min(run_oldest or status_id, status_id)
+
+                    count += 1
+                    self.metrics.incr('tweets_scraped')
+                    # Sentiment is filled in later by the SentimentAnalyzer stage
+                    self.save_to_database(username, tweet, None)
+                    self.queue_media(tweet)
+                    if callback:
+                        callback(f"Found tweet: {tweet['text'][:50]}...")
+                    if progress:
+                        progress(username, count, num_tweets)
+                    yield tweet
+                    if count >= num_tweets:
+                        break
+
+                # Checkpoint every scroll step so a crash or stop can resume from here
+                if contiguous and run_newest is not None:
+                    self.save_scrape_state(username, run_newest, run_oldest)
+                if count >= num_tweets or not self.is_running or reached_known:
+                    break
+                steps += 1
+                if self.config['prune_dom_every'] and steps % self.config['prune_dom_every'] == 0:
+                    self.prune_dom()
+                self.throttle()
+                with self.metrics.timer('scroll_wait'):
+                    found = self.wait_for_new_tweets()
+                if not found:
+                    logging.info(f"No new tweets for {username} within {self.config['delay_max']}s, stopping")
                     break
-                last_height = new_height
 
-            return tweet_texts[:num_tweets]
+            if reached_known:
+                logging.info(f"Reached tweets already scraped for {username}, stopping")
         except Exception as e:
             logging.error(f"Error scraping tweets: {str(e)}")
-            return []
+            self.last_error = e
+        finally:
+            # Also covers a consumer that stops iterating part way through a scroll step
+            if contiguous and run_newest is not None:
+                self.save_scrape_state(username, run_newest, run_oldest)
+            self.writer.flush()
+            self.sentiment.notify()
 
-    def save_to_database(self, username, tweet_text, sentiment):
-        self.cursor.execute(
-            "INSERT INTO scraped_data (username, tweet_text, sentiment) VALUES (?, ?, ?)",
-            (username, tweet_text, sentiment)
+    def prune_dom(self, from_page=None):
+        # Drops processed articles above the viewport so a long run does not keep every tweet rendered.
+        # Only the script extractor marks articles; with network capture or the element extractor every
+        # article above the viewport has already been read, so all of them may go.
+        if from_page is None:
+            from_page = self.config['capture_mode'] != 'network'
+        only_scraped = from_page and self.config['extraction_mode'] != 'elements'
+        try:
+            removed = self.driver.execute_script(PRUNE_TWEETS_JS, self.config['prune_dom_keep'], only_scraped)
+            if removed:
+                self.metrics.incr('dom_articles_pruned', removed)
+        except Exception as e:
+            logging.warning(f"Could not prune scraped tweets from the page: {str(e)}")
+
+    def scrape_search(self, query, num_tweets, since=None, until=None, callback=None, progress=None,
+                      download_media=False):
+        return list(self.iter_search(query, num_tweets, since, until, callback, progress, download_media))
+
+    def iter_search(self, query, num_tweets, since=None, until=None, callback=None, progress=None,
+                    download_media=False):
+        # Splits the query into date windows and scrolls several of them at once, one tab each.
+        # WebDriver commands are serial, but each tab keeps loading while the others are read.
+        # Records are yielded as they are stored, like iter_tweets.
+        count = 0
+        self.last_error = None
+        pending = deque(search_windows(since, until, self.config['search_days'], self.config['search_window_days']))
+        main_handle = self.driver.current_window_handle
+        tabs = []
+        seen_ids = set()
+        # The performance log mixes events from every tab and getResponseBody only reaches the current one,
+        # so search always reads tweets from the page and network capture only drains the log
+        network = self.config['capture_mode'] == 'network'
+        if network:
+            logging.info("Search reads tweets from the page, capture_mode 'network' only applies to timelines")
+        try:
+            for index in range(min(self.config['search_tabs'], len(pending))):
+                if index:
+                    self.driver.switch_to.new_window('tab')
+                    self.apply_resource_blocking()
+                tab = {'handle': self.driver.current_window_handle}
+                self._open_search_window(tab, query, pending.popleft())
+                tabs.append(tab)
+
+            rounds = 0
+            while tabs and count < num_tweets and self.is_running:
+                if network:
+                    self.reset_network_capture()
+                rounds += 1
+                prune = self.config['prune_dom_every'] and rounds % self.config['prune_dom_every'] == 0
+                for tab in list(tabs):
+                    self.driver.switch_to.window(tab['handle'])
+                    with self.metrics.timer('extraction'):
+                        batch = self.extract_dom_tweets(query)
+                    for tweet in batch:
+                        key = tweet_key(tweet)
+                        if key in seen_ids:
+                            self.metrics.incr('duplicates_skipped')
+                            continue
+                        seen_ids.add(key)
+                        tab['last_new'] = time.monotonic()
+                        count += 1
+                        self.metrics.incr('tweets_scraped')
+                        self.save_to_database(query, tweet, None, query)
+                        self.queue_media(tweet, download_media)
+                        if callback:
+                            callback(f"Found tweet: {tweet['text'][:50]}...")
+                        if progress:
+                            progress(query, count, num_tweets)
+                        yield tweet
+                        if count >= num_tweets or not self.is_running:
+                            break
+                    if count >= num_tweets or not self.is_running:
+                        break
+
+                    if time.monotonic() - tab['last_new'] > self.config['delay_max']:
+                        # This window has run dry, move the tab on to the next one
+                        logging.info(f"Search window {tab['window'][0]}..{tab['window'][1]} done for {query}")
+                        if pending:
+                            self._open_search_window(tab, query, pending.popleft())
+                        else:
+                            tabs.remove(tab)
+                        continue
+                    if prune:
+                        self.prune_dom(from_page=True)
+                    self.throttle()
+                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                time.sleep(0.2)
+        except Exception as e:
+            logging.error(f"Error scraping search {query}: {str(e)}")
+            self.last_error = e
+        finally:
+            self._close_search_tabs(main_handle)
+            self.writer.flush()
+            self.sentiment.notify()
+
+    def queue_media(self, tweet, force=False):
+        # Hands media URLs to the download threads; save_images/save_videos pick the kinds unless forced
+        if not tweet['media'] or not tweet['status_id']:
+            return
+        for url in tweet['media']:
+            if not url.startswith('http'):
+                continue  # blob: video sources cannot be fetched outside the page
+            kind = media_kind(url)
+            if force or self.config['save_videos' if kind == 'video' else 'save_images']:
+                self.media.start()
+                self.media.submit(tweet['status_id'], url)
+
+    def _open_search_window(self, tab, query, window):
+        since, until = window
+        tab['window'] = window
+        tab['last_new'] = time.monotonic()
+        search = quote(f"{query} since:{since.isoformat()} until:{until.isoformat()}")
+        self.throttle()
+        with self.metrics.timer('page_load'):
+            self.driver.get(f"{self.config['base_url']}/search?q={search}&src=typed_query&f=live")
+
+    def _close_search_tabs(self, main_handle):
+        try:
+            for handle in self.driver.window_handles:
+                if handle != main_handle:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+            self.driver.switch_to.window(main_handle)
+        except Exception as e:
+            logging.warning(f"Could not close search tabs: {str(e)}")
+
+    def get_scrape_state(self, target):
+        row = self.conn.execute(
+            "SELECT newest_id, oldest_id FROM scrape_state WHERE target = ?", (target,)
+        ).fetchone()
+        return row if row else (None, None)
+
+    def save_scrape_state(self, target, newest_id, oldest_id):
+        self.writer.write(
+            "INSERT INTO scrape_state (target, newest_id, oldest_id, updated_at) VALUES (?, ?, ?, CURRENT_TIMESTAMP) "
+            "ON CONFLICT(target) DO UPDATE SET "
+            "newest_id = MAX(COALESCE(newest_id, excluded.newest_id), excluded.newest_id), "
+            "oldest_id = MIN(COALESCE(oldest_id, excluded.oldest_id), excluded.oldest_id), "
+            "updated_at = CURRENT_TIMESTAMP",
+            (target, newest_id, oldest_id)
         )
-        self.conn.commit()
 
-    def get_scraping_stats(self):
-        self.cursor.execute("SELECT COUNT(*) FROM scraped_data")
-        total_tweets = self.cursor.fetchone()[0]
-        self.cursor.execute("SELECT AVG(sentiment) FROM scraped_data")
-        avg_sentiment = self.cursor.fetchone()[0]
-        return total_tweets, avg_sentiment
+    def wait_for_new_tweets(self):
+        # Returns as soon as the timeline renders new articles; delay_max is the longest we wait
+        timeout = self.config['delay_max']
+        self.driver.set_script_timeout(timeout + 5)
+        return self.driver.execute_async_script(SCROLL_AND_WAIT_JS, timeout)
 
-    def close(self):
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
-        if self.conn:
-            self.conn.close()
+    def save_to_database(self, username, tweet, sentiment, query=None):
+        # Re-scraped tweets refresh their metadata; the score is kept unless the text changed
+        self.writer.write(
+            "INSERT INTO scraped_data (username, tweet_text, sentiment, status_id, author, created_at, media_urls, "
+            "reply_count, retweet_count, like_count, quote_count, view_count, content_hash, query) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(status_id) WHERE status_id IS NOT NULL DO UPDATE SET "
+            "tweet_text = excluded.tweet_text, "
+            "sentiment = CASE WHEN excluded.content_hash = content_hash THEN COALESCE(excluded.sentiment, sentiment) "
+            "ELSE excluded.sentiment END, "
+            "author = COALESCE(excluded.author, author), "
+            "created_at = COALESCE(excluded.created_at, created_at), "
+            "media_urls = excluded.media_urls, "
+            "reply_count = COALESCE(excluded.reply_count, reply_count), "
+            "retweet_count = COALESCE(excluded.retweet_count, retweet_count), "
+            "like_count = COALESCE(excluded.like_count, like_count), "
+            "quote_count = COALESCE(excluded.quote_count, quote_count), "
+            "view_count = COALESCE(excluded.view_count, view_count), "
+            "content_hash = excluded.content_hash, "
+            "query = COALESCE(excluded.query, query) "
+            "ON CONFLICT(username, content_hash) WHERE status_id IS NULL DO NOTHING",
+            (username, tweet['text'], sentiment, tweet['status_id'], tweet['author'],
+             tweet['created_at'], json.dumps(tweet['media']), tweet.get('reply_count'),
+             tweet.get('retweet_count'), tweet.get('like_count'), tweet.get('quote_count'),
+             tweet.get('view_count'), content_hash(tweet['text']), query)
+        )
 
-class TwitterScraperGUI(ThemedTk):
-    def __init__(self):
-        super().__init__()
-        self.title("Twitter Scraper Pro")
-        self.geometry("1000x800")
-        self.set_theme("arc")
-        
-        self.scraper = TwitterScraper()
-        self.create_widgets()
-        self.load_config()
-
-    def create_widgets(self):
-        # Notebook for tabs
-        self.notebook = ttk.Notebook(self)
-        self.notebook.pack(fill=tk.BOTH, expand=True)
-
-        # Create tabs
-        self.main_tab = ttk.Frame(self.notebook)
-        self.settings_tab = ttk.Frame(self.notebook)
-        self.analytics_tab = ttk.Frame(self.notebook)
-        self.accounts_tab = ttk.Frame(self.notebook)
-
-        self.notebook.add(self.main_tab, text="Main")
-        self.notebook.add(self.settings_tab, text="Settings")
-        self.notebook.add(self.analytics_tab, text="Analytics")
-        self.notebook.add(self.accounts_tab, text="Accounts")
-
-        # Create tab contents
-        self.create_main_tab()
-        self.create_settings_tab()
-        self.create_analytics_tab()
-        self.create_accounts_tab()
-
-    def create_main_tab(self):
-        # Login section
-        ttk.Label(self.main_tab, text="Twitter Login", font=("Arial", 12, "bold")).pack(pady=5)
-        
-        login_frame = ttk.Frame(self.main_tab)
-        login_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Label(login_frame, text="Username:").pack(side=tk.LEFT)
-        self.username_entry = ttk.Entry(login_frame)
-        self.username_entry.pack(side=tk.LEFT, padx=5)
-        
-        ttk.Label(login_frame, text="Password:").pack(side=tk.LEFT)
-        self.password_entry = ttk.Entry(login_frame, show="*")
-        self.password_entry.pack(side=tk.LEFT, padx=5)
+    def search_tweets(self, query, username=None, since=None, until=None, limit=50, phrase=False):
+        # Terms are quoted so user input is never parsed as FTS5 syntax; all terms must match
+        terms = [query] if phrase else query.split()
+        if not terms:
+            return []
+        conditions = []
+        params = []
+        if self.fts_enabled:
+            match = ' '.join('"' + term.replace('"', '""') + '"' for term in terms)
+            source = "tweets_fts JOIN scraped_data s ON s.id = tweets_fts.rowid"
+            conditions.append("tweets_fts MATCH ?")
+            params.append(match)
+            rank = "bm25(tweets_fts)"
+        else:
+            source = "scraped_data s"
+            for term in terms:
+                conditions.append("s.tweet_text LIKE ?")
+                params.append(f"%{term}%")
+            rank = "-s.id"
+        if username:
+            conditions.append("s.username = ?")
+            params.append(username)
+        if since:
+            conditions.append("datetime(COALESCE(s.created_at, s.timestamp)) >= datetime(?)")
+            params.append(since)
+        if until:
+            conditions.append("datetime(COALESCE(s.created_at, s.timestamp)) < datetime(?)")
+            params.append(until)
+        params.append(limit)
+        rows = self.conn.execute(
+            f"SELECT s.id, s.status_id, s.username, s.author, s.tweet_text, s.created_at, s.sentiment, {rank} "
+            f"FROM {source} WHERE {' AND '.join(conditions)} ORDER BY {rank} LIMIT ?",
+            params
+        ).fetchall()
+        columns = ('id', 'status_id', 'username', 'author', 'tweet_text', 'created_at', 'sentiment', 'rank')
+        return [dict(zip(columns, row)) for row in rows]
 
-        # Scraping options
-        ttk.Label(self.main_tab, text="\nScraping Options", font=("Arial", 12, "bold")).pack()
-        
-        options_frame = ttk.Frame(self.main_tab)
-        options_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        self.scrape_type = tk.StringVar(value="tweets")
-        ttk.Radiobutton(options_frame, text="User Tweets", variable=self.scrape_type, value="tweets").pack(side=tk.LEFT, padx=5)
-        ttk.Radiobutton(options_frame, text="Hashtag Tweets", variable=self.scrape_type, value="hashtag").pack(side=tk.LEFT, padx=5)
-        ttk.Radiobutton(options_frame, text="Following", variable=self.scrape_type, value="following").pack(side=tk.LEFT, padx=5)
-        ttk.Radiobutton(options_frame, text="Media", variable=self.scrape_type, value="media").pack(side=tk.LEFT, padx=5)
-
-        # Target and number of items
-        target_frame = ttk.Frame(self.main_tab)
-        target_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Label(target_frame, text="Target:").pack(side=tk.LEFT)
-        self.target_entry = ttk.Entry(target_frame)
-        self.target_entry.pack(side=tk.LEFT, padx=5)
-        
-        ttk.Label(target_frame, text="Number of items:").pack(side=tk.LEFT)
-        self.num_items_entry = ttk.Entry(target_frame)
-        self.num_items_entry.pack(side=tk.LEFT, padx=5)
+    def get_scraping_stats(self):
+        # Reads the per-user aggregates instead of scanning scraped_data
+        row = self.conn.execute(
+            "SELECT COALESCE(SUM(tweet_count), 0), SUM(sentiment_sum) / NULLIF(SUM(scored_count), 0) FROM stats_user"
+        ).fetchone()
+        return row[0], row[1]
 
-        # Control buttons
-        control_frame = ttk.Frame(self.main_tab)
-        control_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        self.start_button = ttk.Button(control_frame, text="Start Scraping", command=self.start_scraping)
-        self.start_button.pack(side=tk.LEFT, padx=5)
-        
-        self.stop_button = ttk.Button(control_frame, text="Stop Scraping", command=self.stop_scraping, state=tk.DISABLED)
-        self.stop_button.pack(side=tk.LEFT, padx=5)
+    def get_user_stats(self, username=None):
+        query = "SELECT username, tweet_count, scored_count, sentiment_sum, sentiment_sumsq FROM stats_user"
+        params = ()
+        if username is not None:
+            query += " WHERE username = ?"
+            params = (username,)
+        stats = []
+        for name, count, scored, total, total_squares in self.conn.execute(query + " ORDER BY tweet_count DESC", params):
+            entry = _summarize(count, scored, total, total_squares)
+            entry['username'] = name
+            stats.append(entry)
+        return stats
 
-        # Progress bar
-        self.progress = ttk.Progressbar(self.main_tab, orient="horizontal", length=400, mode="determinate")
-        self.progress.pack(pady=10)
+    def get_timeseries(self, username=None, granularity='day', limit=30):
+        # Most recent buckets first; without a username the buckets are summed over all users
+        if username is None:
+            rows = self.conn.execute(
+                "SELECT bucket, SUM(tweet_count), SUM(scored_count), SUM(sentiment_sum), SUM(sentiment_sumsq) "
+                "FROM stats_timeseries WHERE granularity = ? GROUP BY bucket ORDER BY bucket DESC LIMIT ?",
+                (granularity, limit)
+            )
+        else:
+            rows = self.conn.execute(
+                "SELECT bucket, tweet_count, scored_count, sentiment_sum, sentiment_sumsq FROM stats_timeseries "
+                "WHERE username = ? AND granularity = ? ORDER BY bucket DESC LIMIT ?",
+                (username, granularity, limit)
+            )
+        series = []
+        for bucket, count, scored, total, total_squares in rows:
+            entry = _summarize(count, scored, total, total_squares)
+            entry['bucket'] = bucket
+            series.append(entry)
+        return series
 
-        # Status and output
-        self.status_label = ttk.Label(self.main_tab, text="Status: Ready")
-        self.status_label.pack()
+    def get_sentiment_histogram(self, username=None):
+        query = "SELECT bucket, SUM(count) FROM stats_histogram"
+        params = ()
+        if username is not None:
+            query += " WHERE username = ?"
+            params = (username,)
+        counts = dict(self.conn.execute(query + " GROUP BY bucket", params).fetchall())
+        width = 2 / HISTOGRAM_BUCKETS
+        return [(round(-1 + bucket * width, 2), round(-1 + (bucket + 1) * width, 2), counts.get(bucket, 0))
+                for bucket in range(HISTOGRAM_BUCKETS)]
 
-        self.output_text = scrolledtext.ScrolledText(self.main_tab, height=15)
-        self.output_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+    def quit_driver(self):
+        if self.driver:
+            try:
+                self.driver.quit()
+            except Exception as e:
+                logging.warning(f"Error quitting ChromeDriver: {str(e)}")
+            self.driver = None
+        self.logged_in_as = None
 
-    def create_settings_tab(self):
-        # Delay settings
-        ttk.Label(self.settings_tab, text="Delay Settings", font=("Arial", 12, "bold")).pack(pady=5)
-        
-        delay_frame = ttk.Frame(self.settings_tab)
-        delay_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Label(delay_frame, text="Minimum Delay (seconds):").pack(side=tk.LEFT)
-        self.min_delay_entry = ttk.Entry(delay_frame)
-        self.min_delay_entry.pack(side=tk.LEFT, padx=5)
-        
-        ttk.Label(delay_frame, text="Maximum Delay (seconds):").pack(side=tk.LEFT)
-        self.max_delay_entry = ttk.Entry(delay_frame)
-        self.max_delay_entry.pack(side=tk.LEFT, padx=5)
+    def close(self):
+        self.quit_driver()
+        spare = self._take_spare_driver()
+        if spare is not None:
+            try:
+                spare[0].quit()
+            except Exception as e:
+                logging.warning(f"Error quitting pre-warmed ChromeDriver: {str(e)}")
+        if self.owns_pipeline:
+            if self.sentiment:
+                self.sentiment.stop()
+            if self.media:
+                self.media.stop()
+            if self.writer:
+                self.writer.stop()
+            self.metrics.close()
+        if self.conn:
+            self.conn.close()
 
-        # Proxy settings
-        ttk.Label(self.settings_tab, text="\nProxy Settings", font=("Arial", 12, "bold")).pack()
-        
-        self.proxy_var = tk.BooleanVar(value=self.scraper.config['proxy_enabled'])
-        ttk.Checkbutton(self.settings_tab, text="Enable Proxies", variable=self.proxy_var).pack(pady=5)
+class ScrapeScheduler:
+    def __init__(self, scraper, targets, num_tweets, sessions=None, credentials=None, callback=None, mode='full',
+                 progress=None):
+        self.scraper = scraper
+        self.targets = list(targets)
+        self.num_tweets = num_tweets
+        self.mode = mode
+        self.sessions = sessions or scraper.config['max_sessions']
+        self.credentials = credentials
+        self.callback = callback
+        self.progress = progress
+        self.is_running = False
+        self.jobs = queue.Queue()
+        self.lock = threading.Lock()
+        self.active_sessions = []
+        self.workers = []
+        self.results = {}
+        self.failures = {}
 
-        proxy_frame = ttk.Frame(self.settings_tab)
-        proxy_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Label(proxy_frame, text="Proxies (ip:port:username:password):").pack()
-        self.proxies_text = tk.Text(proxy_frame, height=5)
-        self.proxies_text.pack(fill=tk.X, padx=5)
-        for proxy in self.scraper.config['proxies']:
-            self.proxies_text.insert(tk.END, proxy + "\n")
-
-        # Save settings button
-        ttk.Button(self.settings_tab, text="Save Settings", command=self.save_settings).pack(pady=10)
-
-    def create_analytics_tab(self):
-        # Statistics
-        ttk.Label(self.analytics_tab, text="Scraping Statistics", font=("Arial", 12, "bold")).pack(pady=5)
-        
-        self.total_tweets_label = ttk.Label(self.analytics_tab, text="Total Tweets Scraped: 0")
-        self.total_tweets_label.pack()
-        
-        self.avg_sentiment_label = ttk.Label(self.analytics_tab, text="Average Sentiment: 0.00")
-        self.avg_sentiment_label.pack()
+    def run(self):
+        self.is_running = True
+        self.scraper.metrics.begin_run()
+        for target in self.targets:
+            self.jobs.put((target, 0))
 
-        # Export buttons
-        ttk.Button(self.analytics_tab, text="Export Tweets", command=self.export_tweets).pack(pady=5)
-        ttk.Button(self.analytics_tab, text="Export Sentiments", command=self.export_sentiments).pack(pady=5)
+        config = self.scraper.config
+        proxies = config['proxies'] if config['proxy_enabled'] else []
+        workers = self.workers = []
+        for index in range(min(self.sessions, len(self.targets))):
+            # Each session keeps its own proxy for its whole lifetime
+            proxy = proxies[index % len(proxies)] if proxies else None
+            worker = threading.Thread(target=self._run_session, args=(index, proxy), name=f"session-{index}")
+            workers.append(worker)
 
-    def create_accounts_tab(self):
-        # Account management
-        ttk.Label(self.accounts_tab, text="Account Management", font=("Arial", 12, "bold")).pack(pady=5)
-        
-        self.accounts_text = tk.Text(self.accounts_tab, height=10)
-        self.accounts_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        ttk.Button(self.accounts_tab, text="Add Account", command=self.add_account).pack(pady=5)
-        ttk.Button(self.accounts_tab, text="Remove Account", command=self.remove_account).pack(pady=5)
-
-    def load_config(self):
-        self.min_delay_entry.delete(0, tk.END)
-        self.min_delay_entry.insert(0, str(self.scraper.config['delay_min']))
-        self.max_delay_entry.delete(0, tk.END)
-        self.max_delay_entry.insert(0, str(self.scraper.config['delay_max']))
-        self.proxy_var.set(self.scraper.config['proxy_enabled'])
-        self.proxies_text.delete(1.0, tk.END)
-        for proxy in self.scraper.config['proxies']:
-            self.proxies_text.insert(tk.END, proxy + "\n")
-
-    def save_settings(self):
-        try:
-            self.scraper.config['delay_min'] = float(self.min_delay_entry.get())
-            self.scraper.config['delay_max'] = float(self.max_delay_entry.get())
-            self.scraper.config['proxy_enabled'] = self.proxy_var.get()
-            self.scraper.config['proxies'] = [line.strip() for line in self.proxies_text.get(1.0, tk.END).split('\n') if line.strip()]
-            self.scraper.save_config()
-            messagebox.showinfo("Success", "Settings saved successfully")
-        except ValueError:
-            messagebox.showerror("Error", "Please enter valid numbers for delays")
-
-    def update_status(self, message):
-        self.status_label.config(text=f"Status: {message}")
-        self.output_text.insert(tk.END, f"{message}\n")
-        self.output_text.see(tk.END)
-
-    def start_scraping(self):
-        if self.scraper.is_running:
-            messagebox.showwarning("Warning", "Scraper is already running")
-            return
+        start_time = time.monotonic()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.monotonic() - start_time
+        self.is_running = False
 
-        username = self.username_entry.get()
-        password = self.password_entry.get()
-        target = self.target_entry.get()
-        num_items = int(self.num_items_entry.get() or 10)
-        scrape_type = self.scrape_type.get()
+        total = sum(self.results.values())
+        summary = {
+            'targets': len(self.targets),
+            'completed': len(self.results),
+            'results': dict(self.results),
+            'failed': dict(self.failures),
+            'tweets': total,
+            'sessions': len(workers),
+            'elapsed': elapsed,
+            'tweets_per_second': total / elapsed if elapsed > 0 else 0.0
+        }
+        self.scraper.metrics.report(**summary)
+        summary['metrics'] = self.scraper.metrics.snapshot()
+        logging.info(
+            f"Scraped {total} tweets from {len(self.results)}/{len(self.targets)} targets "
+            f"with {len(workers)} sessions in {elapsed:.1f}s ({summary['tweets_per_second']:.2f} tweets/s)"
+        )
+        return summary
 
-        if not username or not password or not target:
-            messagebox.showerror("Error", "Please fill all required fields")
-            return
+    def stop(self):
+        self.is_running = False
+        with self.lock:
+            for session in self.active_sessions:
+                session.is_running = False
 
-        self.scraper.is_running = True
-        self.start_button.config(state=tk.DISABLED)
-        self.stop_button.config(state=tk.NORMAL)
-        self.progress["value"] = 0
-        
-        threading.Thread(target=self.run_scraping, args=(username, password, target, num_items, scrape_type)).start()
-
-    def stop_scraping(self):
-        self.scraper.is_running = False
-        self.start_button.config(state=tk.NORMAL)
-        self.stop_button.config(state=tk.DISABLED)
-        self.update_status("Scraping stopped by user")
-        if self.scraper.driver:
-            self.scraper.driver.quit()
-            self.scraper.driver = None
-
-    def run_scraping(self, username, password, target, num_items, scrape_type):
+    def wait(self):
+        for worker in self.workers:
+            worker.join()
+
+    def _run_session(self, index, proxy):
+        session = self.scraper.create_session(proxy)
+        session.is_running = True
+        with self.lock:
+            self.active_sessions.append(session)
         try:
-            if self.scraper.login(username, password):
-                self.update_status("Logged in successfully")
-                
-                if scrape_type == "tweets":
-                    tweets = self.scraper.scrape_tweets(target, num_items, self.update_status)
-                    if tweets:
-                        self.update_status(f"Scraped {len(tweets)} tweets")
-                        self.update_analytics()
-                
-                elif scrape_type == "hashtag":
-                    # Implement hashtag scraping
-                    pass
-                
-                elif scrape_type == "following":
-                    # Implement following scraping
-                    pass
-                
-                elif scrape_type == "media":
-                    # Implement media scraping
-                    pass
-            else:
-                self.update_status("Login failed")
-        except Exception as e:
-            self.update_status(f"Error: {str(e)}")
+            while self.is_running:
+                try:
+                    target, attempt = self.jobs.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    self._scrape_target(session, target)
+                except Exception as e:
+                    # Failures only cost this session its browser; the target is retried on any session
+                    logging.warning(f"Session {index} failed on {target} (attempt {attempt + 1}): {str(e)}")
+                    if session.active_proxy:
+                        session.metrics.incr('proxy_failures')
+                    session.quit_driver()
+                    if attempt + 1 < self.scraper.config['max_retries'] and self.is_running:
+                        session.metrics.incr('retries')
+                        self.jobs.put((target, attempt + 1))
+                    else:
+                        with self.lock:
+                            self.failures[target] = str(e)
         finally:
-            self.scraper.is_running = False
-            self.start_button.config(state=tk.NORMAL)
-            self.stop_button.config(state=tk.DISABLED)
-            self.update_status("Scraping completed")
-            if self.scraper.driver:
-                self.scraper.driver.quit()
-                self.scraper.driver = None
-
-    def update_analytics(self):
-        total_tweets, avg_sentiment = self.scraper.get_scraping_stats()
-        self.total_tweets_label.config(text=f"Total Tweets Scraped: {total_tweets}")
-        self.avg_sentiment_label.config(text=f"Average Sentiment: {avg_sentiment:.2f}")
-
-    def export_tweets(self):
-        self.cursor.execute("SELECT tweet_text FROM scraped_data")
-        tweets = self.cursor.fetchall()
-        with open("exported_tweets.txt", "w", encoding="utf-8") as f:
-            for tweet in tweets:
-                f.write(f"{tweet[0]}\n")
-        messagebox.showinfo("Success", "Tweets exported successfully")
-
-    def export_sentiments(self):
-        self.cursor.execute("SELECT sentiment FROM scraped_data")
-        sentiments = self.cursor.fetchall()
-        with open("exported_sentiments.txt", "w") as f:
-            for sentiment in sentiments:
-                f.write(f"{sentiment[0]}\n")
-        messagebox.showinfo("Success", "Sentiments exported successfully")
-
-    def add_account(self):
-        username = self.username_entry.get()
-        password = self.password_entry.get()
-        if username and password:
-            self.accounts_text.insert(tk.END, f"{username}:{password}\n")
-            self.update_status(f"Added account: {username}")
-
-    def remove_account(self):
-        selection = self.accounts_text.tag_ranges(tk.SEL)
-        if selection:
-            self.accounts_text.delete(selection[0], selection[1])
-            self.update_status("Removed selected account")
+            with self.lock:
+                self.active_sessions.remove(session)
+            session.close()
+
+    def _scrape_target(self, session, target):
+        if self.credentials:
+            if not session.ensure_logged_in(*self.credentials):
+                raise RuntimeError("Login failed")
+        elif session.driver is None:
+            session.setup_driver()
+        # Counted as they stream past, the records themselves are already in the database
+        count = sum(1 for _ in session.iter_tweets(target, self.num_tweets, self.callback, self.mode, self.progress))
+        if session.last_error is not None:
+            raise session.last_error
+        with self.lock:
+            self.results[target] = count
+        if self.callback:
+            self.callback(f"Scraped {count} tweets from {target}")
 
 if __name__ == "__main__":
+    # The GUI lives in gui.py so headless runs never import tkinter
+    from gui import TwitterScraperGUI
     app = TwitterScraperGUI()
-    app.mainloop() 
\ No newline at end of file
+    app.mainloop()
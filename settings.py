@@ -0,0 +1,74 @@
+import json
+import os
+
+# Paths and config defaults, kept free of selenium so the CLI and exporter can load them cheaply
+
+DB_PATH = 'scraper.db'
+CONFIG_PATH = 'scraper_config.json'
+
+# Requests the light browser profile drops: images, video, fonts and analytics beacons
+BLOCKED_URL_PATTERNS = [
+    '*pbs.twimg.com/*', '*video.twimg.com/*', '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.mp4', '*.m3u8',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*/jot/*', '*google-analytics.com/*', '*googletagmanager.com/*',
+    '*doubleclick.net/*', '*ads-twitter.com/*', '*analytics.twitter.com/*'
+]
+
+DEFAULT_CONFIG = {
+    'delay_max': 5,
+    'max_retries': 3,
+    'proxy_enabled': False,
+    'proxies': [],
+    'max_tweets': 100,
+    'save_images': False,
+    'save_videos': False,
+    'media_dir': 'media',
+    'media_workers': 4,
+    'media_per_host': 2,
+    'media_retries': 3,
+    'media_queue_size': 5000,
+    'media_cache_size': 10000,
+    'db_batch_size': 100,
+    'db_flush_interval': 1.0,
+    'db_queue_size': 10000,
+    'base_url': 'https://twitter.com',
+    'max_sessions': 2,
+    'session_dir': 'sessions',
+    'persist_profile': False,
+    'keep_driver_alive': True,
+    'headless': False,
+    'browser_profile': 'full',
+    'blocked_urls': BLOCKED_URL_PATTERNS,
+    'prewarm_driver': False,
+    'driver_cache_path': 'driver_cache.json',
+    # 'account' applies only to logged-in sessions; every session without a proxy shares one 'direct' bucket
+    'rate_limits': {
+        'account': {'rate': 0.5, 'burst': 5},
+        'proxy': {'rate': 1.0, 'burst': 10}
+    },
+    'extraction_mode': 'script',
+    'capture_mode': 'dom',
+    'prune_dom_every': 10,
+    'prune_dom_keep': 20,
+    'sentiment_enabled': True,
+    'sentiment_workers': 2,
+    'sentiment_batch_size': 200,
+    'sentiment_cache_size': 10000,
+    'search_tabs': 3,
+    'search_days': 28,
+    'search_window_days': 7,
+    'metrics_enabled': False,
+    'metrics_json_path': 'metrics.jsonl',
+    'metrics_prometheus_path': None,
+    'metrics_port': None
+}
+
+def load_config():
+    config = dict(DEFAULT_CONFIG)
+    if os.path.exists(CONFIG_PATH):
+        with open(CONFIG_PATH, 'r') as f:
+            config.update(json.load(f))
+    return config
+
+def save_config(config):
+    with open(CONFIG_PATH, 'w') as f:
+        json.dump(config, f, indent=4)
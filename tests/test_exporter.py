@@ -0,0 +1,37 @@
+import json
+import sqlite3
+
+from exporter import EXPORT_COLUMNS, TweetExporter
+
+def make_db(path, sentiments):
+    conn = sqlite3.connect(path)
+    conn.execute(f"CREATE TABLE scraped_data (id INTEGER PRIMARY KEY, {', '.join(EXPORT_COLUMNS[1:])})")
+    conn.executemany("INSERT INTO scraped_data (id, tweet_text, sentiment) VALUES (?, ?, ?)",
+                     [(index, f"tweet {index}", sentiment) for index, sentiment in enumerate(sentiments, 1)])
+    conn.commit()
+    return conn
+
+def read_ids(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line)['id'] for line in f]
+
+def test_incremental_export_holds_back_unscored_rows(tmp_path):
+    conn = make_db(tmp_path / 'scraper.db', [0.1, 0.2, None, 0.4, 0.5])
+    exporter = TweetExporter(str(tmp_path / 'scraper.db'))
+    path = str(tmp_path / 'tweets.jsonl')
+
+    assert exporter.export(path, incremental=True, hold_unscored=True)['last_id'] == 2
+    conn.execute("UPDATE scraped_data SET sentiment = 0.3 WHERE id = 3")
+    conn.commit()
+    exporter.export(path, incremental=True, hold_unscored=True)
+
+    assert read_ids(path) == [1, 2, 3, 4, 5]
+    conn.close()
+
+def test_incremental_export_without_hold_keeps_nulls(tmp_path):
+    make_db(tmp_path / 'scraper.db', [0.1, None]).close()
+    path = str(tmp_path / 'tweets.jsonl')
+
+    result = TweetExporter(str(tmp_path / 'scraper.db')).export(path, incremental=True)
+
+    assert result['rows'] == 2
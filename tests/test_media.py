@@ -0,0 +1,116 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+pytest.importorskip('urllib3')
+
+from media import MediaDownloader
+
+PHOTO = b'\xff\xd8\xff\xe0' + bytes(2048)
+OTHER = b'\x89PNG\r\n\x1a\n' + bytes(1024)
+
+# Same DDL as TwitterScraper.setup_database, which needs selenium to import
+MEDIA_TABLE = '''
+    CREATE TABLE media (
+        status_id TEXT,
+        url TEXT,
+        kind TEXT,
+        sha256 TEXT,
+        path TEXT,
+        size INTEGER,
+        content_type TEXT,
+        downloaded_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (status_id, url)
+    )
+'''
+
+class MediaServer:
+    # /a.jpg and /copy.jpg serve the same bytes, /flaky.png answers 503 once before succeeding
+    def __init__(self):
+        requests = self.requests = {}
+        lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with lock:
+                    seen = requests[self.path] = requests.get(self.path, 0) + 1
+                if self.path == '/flaky.png' and seen == 1:
+                    self.send_error(503)
+                    return
+                time.sleep(0.2)  # Long enough for two workers to want the same URL at once
+                body = OTHER if self.path.endswith('.png') else PHOTO
+                self.send_response(200)
+                self.send_header('Content-Type', 'image/png' if self.path.endswith('.png') else 'image/jpeg')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+class DirectWriter:
+    # Stands in for DatabaseWriter and applies each statement straight away
+    def __init__(self, db_path):
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.lock = threading.Lock()
+
+    def write(self, sql, params):
+        with self.lock:
+            self.conn.execute(sql, params)
+            self.conn.commit()
+
+@pytest.fixture
+def stored(tmp_path):
+    db_path = str(tmp_path / 'scraper.db')
+    writer = DirectWriter(db_path)
+    writer.conn.execute(MEDIA_TABLE)
+    with MediaServer() as server:
+        downloader = MediaDownloader(db_path, writer, media_dir=str(tmp_path / 'media'), backoff=0)
+        downloader.start()
+        for status_id, name in (('1', 'a.jpg'), ('2', 'a.jpg'), ('2', 'copy.jpg'), ('3', 'flaky.png')):
+            assert downloader.submit(status_id, f"{server.url}/{name}")
+        assert not downloader.submit('1', f"{server.url}/a.jpg")  # Already queued
+        downloader.stop()  # Workers drain the queue before they exit
+        rows = writer.conn.execute(
+            "SELECT status_id, url, kind, sha256, path, size, content_type FROM media ORDER BY status_id, url"
+        ).fetchall()
+        yield server, rows, downloader
+
+def test_same_url_is_downloaded_once(stored):
+    server, rows, downloader = stored
+    assert server.requests['/a.jpg'] == 1
+    assert downloader.queued == set() and downloader.in_flight == {}
+
+def test_media_rows_are_content_addressed(stored):
+    server, rows, downloader = stored
+    by_key = {(status_id, url.rsplit('/', 1)[1]): row for status_id, url, *row in rows}
+    assert sorted(by_key) == [('1', 'a.jpg'), ('2', 'a.jpg'), ('2', 'copy.jpg'), ('3', 'flaky.png')]
+
+    photo = hashlib.sha256(PHOTO).hexdigest()
+    for key in (('1', 'a.jpg'), ('2', 'a.jpg'), ('2', 'copy.jpg')):
+        kind, sha256, path, size, content_type = by_key[key]
+        assert (kind, sha256, size, content_type) == ('image', photo, len(PHOTO), 'image/jpeg')
+        assert path.endswith(f"{photo[:2]}/{photo}.jpg")
+    with open(by_key[('1', 'a.jpg')][2], 'rb') as f:
+        assert f.read() == PHOTO
+
+def test_server_errors_are_retried(stored):
+    server, rows, downloader = stored
+    assert server.requests['/flaky.png'] == 2
+    assert rows[-1][3] == hashlib.sha256(OTHER).hexdigest()
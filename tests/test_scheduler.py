@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip('selenium')
+
+from benchmark import TimelineServer, generate_timeline_page
+from scraper import TwitterScraper, ScrapeScheduler
+
+@pytest.fixture
+def server():
+    # 'gone' answers with an empty 404 page, so every attempt on it times out waiting for tweets
+    with TimelineServer(generate_timeline_page(60, page_size=20, latency_ms=50), missing={'gone'}) as server:
+        yield server
+
+@pytest.fixture
+def scraper(server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Fresh scraper.db and no saved config
+    config = TwitterScraper.load_config()
+    config.update({
+        'base_url': server.url,
+        'headless': True,
+        'proxy_enabled': False,
+        'sentiment_enabled': False,
+        'delay_max': 2.0,
+        'max_sessions': 2,
+        'max_retries': 2,
+        'prewarm_driver': False,
+        'rate_limits': {},
+        'metrics_enabled': True,
+        'metrics_json_path': None,
+        'metrics_prometheus_path': None,
+        'metrics_port': None
+    })
+    scraper = TwitterScraper(config)
+    try:
+        scraper.setup_driver()
+    except Exception as e:
+        scraper.close()
+        pytest.skip(f"Chrome is not available: {e}")
+    scraper.quit_driver()
+    yield scraper
+    scraper.close()
+
+def test_failing_target_is_retried_and_isolated(scraper):
+    summary = ScrapeScheduler(scraper, ['bench', 'gone', 'other'], 30).run()
+
+    assert summary['results'] == {'bench': 30, 'other': 30}
+    assert list(summary['failed']) == ['gone']
+    assert summary['metrics']['counters']['retries'] == 1
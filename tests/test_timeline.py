@@ -0,0 +1,67 @@
+import json
+import os
+
+import pytest
+
+from timeline import TIMELINE_URL_PATTERN, parse_timeline_payload
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return json.load(f)
+
+@pytest.fixture
+def user_tweets():
+    return {record['status_id']: record for record in parse_timeline_payload(load_fixture('user_tweets.json'))}
+
+def test_records_keep_timeline_order_and_skip_tombstones(user_tweets):
+    assert list(user_tweets) == [
+        '1739012345678901248', '1743210987654321408', '1743100000000000000', '1742900000000000000',
+        '1742500000000000000'
+    ]
+
+def test_pinned_tweet_is_marked(user_tweets):
+    assert user_tweets['1739012345678901248']['social_context'] == 'Pinned'
+    assert all(record['social_context'] is None
+               for status_id, record in user_tweets.items() if status_id != '1739012345678901248')
+
+def test_plain_tweet(user_tweets):
+    assert user_tweets['1743210987654321408'] == {
+        'status_id': '1743210987654321408',
+        'author': 'exampledev',
+        'text': 'Shipping the new exporter today',
+        'created_at': '2024-01-05T14:30:12.000Z',
+        'media': ['https://pbs.twimg.com/media/GDFexampleAAA.jpg'],
+        'reply_count': 1,
+        'retweet_count': 2,
+        'like_count': 15,
+        'quote_count': 0,
+        'view_count': 981,
+        'social_context': None
+    }
+
+def test_visibility_wrapper_is_unwrapped(user_tweets):
+    record = user_tweets['1743100000000000000']
+    assert record['author'] == 'exampledev'  # Only under user.legacy in this response
+    assert record['text'] == 'Replies to this post are limited'
+
+def test_note_tweet_uses_full_text(user_tweets):
+    record = user_tweets['1742900000000000000']
+    assert len(record['text']) > 280
+    assert not record['text'].endswith('https://t.co/abc123')
+
+def test_video_uses_highest_bitrate_mp4(user_tweets):
+    assert user_tweets['1742500000000000000']['media'] == [
+        'https://video.twimg.com/ext_tw_video/1742499990000000000/pu/vid/1280x720/high.mp4'
+    ]
+
+def test_search_timeline():
+    records = parse_timeline_payload(load_fixture('search_timeline.json'))
+    assert [(record['status_id'], record['author']) for record in records] == [('1743300000000000000', 'someoneelse')]
+    assert records[0]['view_count'] == 77
+
+def test_timeline_url_pattern():
+    assert TIMELINE_URL_PATTERN.search('https://x.com/i/api/graphql/V7H0Ap3_Hh2FyS75OCDO3Q/UserTweets?variables=%7B%7D')
+    assert TIMELINE_URL_PATTERN.search('https://x.com/i/api/graphql/gkjsKepM6gl_HmFWoWKfgg/SearchTimeline?variables=')
+    assert not TIMELINE_URL_PATTERN.search('https://x.com/i/api/graphql/qW5u-DAuXpMEG0zA1F7UGQ/UserByScreenName?variables=')
@@ -0,0 +1,70 @@
+import re
+from datetime import datetime, timezone
+
+# GraphQL operations whose responses carry timeline tweets
+TIMELINE_URL_PATTERN = re.compile(
+    r'/graphql/[^/]+/(UserTweets|UserTweetsAndReplies|UserMedia|SearchTimeline|HomeTimeline|HomeLatestTimeline|TweetDetail)\b'
+)
+
+def parse_timeline_payload(payload):
+    records = []
+    for result, pinned in _iter_tweet_results(payload):
+        record = _tweet_record(result)
+        if record:
+            if pinned:
+                record['social_context'] = 'Pinned'
+            records.append(record)
+    return records
+
+def _iter_tweet_results(node):
+    # Tweets sit at different depths depending on the timeline type, so walk the whole document in order
+    stack = [(node, False)]
+    while stack:
+        node, pinned = stack.pop()
+        if isinstance(node, dict):
+            pinned = pinned or node.get('type') == 'TimelinePinEntry'
+            tweet_results = node.get('tweet_results')
+            if isinstance(tweet_results, dict) and 'result' in tweet_results:
+                yield tweet_results['result'], pinned
+            stack.extend((value, pinned) for key, value in reversed(list(node.items())) if key != 'tweet_results')
+        elif isinstance(node, list):
+            stack.extend((value, pinned) for value in reversed(node))
+
+def _tweet_record(result):
+    if result.get('__typename') == 'TweetWithVisibilityResults':
+        result = result.get('tweet', {})
+    legacy = result.get('legacy')
+    if not legacy:
+        return None  # Tombstones and unavailable tweets
+
+    user = result.get('core', {}).get('user_results', {}).get('result', {})
+    author = user.get('core', {}).get('screen_name') or user.get('legacy', {}).get('screen_name')
+    note = result.get('note_tweet', {}).get('note_tweet_results', {}).get('result', {})
+
+    created_at = legacy.get('created_at')
+    if created_at:
+        created = datetime.strptime(created_at, '%a %b %d %H:%M:%S %z %Y').astimezone(timezone.utc)
+        created_at = created.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+    media = []
+    for item in legacy.get('extended_entities', {}).get('media', []):
+        variants = [v for v in item.get('video_info', {}).get('variants', []) if v.get('content_type') == 'video/mp4']
+        if variants:
+            media.append(max(variants, key=lambda v: v.get('bitrate', 0))['url'])
+        elif item.get('media_url_https'):
+            media.append(item['media_url_https'])
+
+    views = result.get('views', {}).get('count')
+    return {
+        'status_id': result.get('rest_id') or legacy.get('id_str'),
+        'author': author,
+        'text': note.get('text') or legacy.get('full_text', ''),
+        'created_at': created_at,
+        'media': media,
+        'reply_count': legacy.get('reply_count'),
+        'retweet_count': legacy.get('retweet_count'),
+        'like_count': legacy.get('favorite_count'),
+        'quote_count': legacy.get('quote_count'),
+        'view_count': int(views) if views else None,
+        'social_context': None
+    }